@@ -29,21 +29,107 @@ Features:
 
     Author: Mikhail Tsarev
 """
+import os
 import json
-from typing import Union
-from copy import deepcopy
+import logging
+from collections import deque
+from copy import copy, deepcopy
+from typing import Union, IO
 from datetime import datetime
 
 from elasticsearch import helpers, Elasticsearch, client
-from elasticsearch.exceptions import NotFoundError
 from elasticsearch_dsl import (mapping, Field as DslField,
                                Document as DslDocument, connections)
 from elasticsearch_dsl.utils import DOC_META_FIELDS
 from elasticsearch_dsl.document import IndexMeta
 
-from .fields import Field, Dict, DocumentDict, Date
+from .fields import Field, Dict, DocumentDict, Date, _UNSET
 from .exceptions import InitializationRequired, ValidationException
 
+logger = logging.getLogger(__name__)
+
+# Pairs of meta fields names with and without the underscore prefix.
+_PREFIXED_META_FIELDS = tuple(("_" + name, name) for name in DOC_META_FIELDS)
+
+# Only the parts of bulk responses used by Document.bulk_save(), so that
+# Elasticsearch doesn't send (and the client doesn't parse) the rest.
+_BULK_FILTER_PATH = "items.*._id,items.*._index,items.*.status,items.*.error"
+
+
+def _compile_fields_serializer(field_names: list):
+    """
+    Generates a function serializing the fields dict of a document with
+    the passed fields. The function does the same as Dict.serialize(),
+    but accesses every field directly instead of iterating through them.
+    If undefined fields were added to the dict, the generic
+    serialize() is used instead.
+
+    Parameters
+    ----------
+    field_names: list
+        Names of the fields defined in the document.
+
+    Returns
+    -------
+    function
+        Function accepting the fields dict and returning it's serialized
+        representation.
+    """
+    lines = ["def serialize(fields_dict):",
+             "    properties = fields_dict._properties",
+             f"    if len(properties) != {len(field_names)}:",
+             "        return fields_dict.serialize()",
+             "    result = {}"]
+    for field_name in field_names:
+        lines += [f"    field = properties[{field_name!r}]",
+                  "    value = field._serialize_if_set()",
+                  "    if value is not UNSET:",
+                  f"        result[{field_name!r}] = value"]
+    lines.append("    return result or None")
+    namespace = {'UNSET': _UNSET}
+    exec(compile("\n".join(lines), "<es_orm serializer>", "exec"), namespace)
+    return namespace['serialize']
+
+
+def _compile_fields_deserializer(field_names: list):
+    """
+    Generates a function deserializing data into the fields dict of
+    a document with the passed fields. The function does the same as
+    Dict.deserialize() with auto_set, but accesses every field directly
+    and doesn't modify the passed data. If undefined fields were added
+    to the dict, the generic deserialize() is used instead.
+
+    Parameters
+    ----------
+    field_names: list
+        Names of the fields defined in the document.
+
+    Returns
+    -------
+    function
+        Function accepting the fields dict and the data, which returns
+        the deserialized data.
+    """
+    lines = ["def deserialize(fields_dict, data):",
+             "    properties = fields_dict._properties",
+             f"    if len(properties) != {len(field_names)} "
+             "or type(data) is not dict:",
+             "        return fields_dict.deserialize(data, auto_set=True)",
+             "    result = {}"]
+    for field_name in field_names:
+        lines += [f"    field = properties[{field_name!r}]",
+                  f"    if {field_name!r} in data:",
+                  f"        value = result[{field_name!r}] = "
+                  f"field.deserialize(data[{field_name!r}])",
+                  "        field.set(value)",
+                  "    else:",
+                  "        field.set(None)"]
+    lines.append("    return result or None")
+    namespace = {}
+    exec(compile("\n".join(lines), "<es_orm deserializer>", "exec"),
+         namespace)
+    return namespace['deserialize']
+
 
 class AdvancedIndexMeta(IndexMeta):
     """
@@ -57,25 +143,28 @@ class AdvancedIndexMeta(IndexMeta):
         for base in bases[::-1]:
             if hasattr(base, '_fields_dict'):
                 attrs.update(base._fields_dict)
-        for attr in attrs:
-            if isinstance(attrs[attr], DslField):
+        for attr, attr_value in attrs.items():
+            if isinstance(attr_value, Field):
+                orm_fields[attr] = attr_value
+            elif isinstance(attr_value, DslField):
                 raise TypeError(f"Please don't use elasticsearch_dsl fields"
                                 f"(you use it on the {attr} field). "
                                 f"Use es_orm.fields classes instead.")
-            elif isinstance(attrs[attr], Field):
-                orm_fields.update({attr: attrs[attr]})
             else:
-                new_attrs[attr] = attrs[attr]
+                new_attrs[attr] = attr_value
         result = super().__new__(cls, name, bases, new_attrs)
-        if result.timestamp_enabled():
+        # The Index options don't change after the class creation.
+        result._timestamp_enabled = bool(getattr(
+            getattr(result, 'Index', None), 'timestamp_enabled', False))
+        if result._timestamp_enabled:
             orm_fields['timestamp'] = Date()
         for field_name, field_object in orm_fields.items():
             field_object.__set_name__(result, field_name)
 
-        inner_attrs_enabled = True
-        if hasattr(result, 'Index') and hasattr(result.Index, 'attrs_enabled') \
-                and not result.Index.attrs_enabled:
-            inner_attrs_enabled = False
+        try:
+            inner_attrs_enabled = bool(result.Index.attrs_enabled)
+        except AttributeError:
+            inner_attrs_enabled = True
 
         result._fields_dict = Dict(properties=orm_fields,
                                    inner_attrs_enabled=inner_attrs_enabled,
@@ -87,6 +176,26 @@ class AdvancedIndexMeta(IndexMeta):
         for field_object in orm_fields.values():
             if field_object._analyzer:
                 result._index.analyzer(field_object._analyzer)
+
+        # The fields are known now, so the functions converting them
+        # are generated once for the whole class.
+        if orm_fields:
+            result._fields_serializer = staticmethod(
+                _compile_fields_serializer(list(orm_fields)))
+            result._fields_deserializer = staticmethod(
+                _compile_fields_deserializer(list(orm_fields)))
+        else:
+            result._fields_serializer = staticmethod(Dict.serialize)
+            result._fields_deserializer = staticmethod(
+                lambda fields_dict, data: fields_dict.deserialize(data, True))
+
+        # Mappings retrieved from Elasticsearch by get_mapping().
+        result._cached_mappings = {}
+
+        # Used instead of dir() calls while getting and setting attributes.
+        # Attributes added to the class later aren't in it, so they're
+        # looked up in the class itself as a fallback.
+        result._instance_attr_set = frozenset(dir(result))
         return result
 
 
@@ -96,51 +205,77 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
     Inherits from the default elasticsearch_dsl Document, thus making it
     possible to use all the functionality it implements and some more.
     """
-    def __init__(self, json_data: Union[str, dict] = None, meta: dict = None,
-                 **kwargs):
-        self._fields_dict = deepcopy(self._fields_dict)
+    # True when the fields dict of the document is a shallow copy of the
+    # class-level one, which shares the fields not accessed yet.
+    _fields_partially_shared = False
 
+    def __init__(self, json_data: Union[str, bytes, dict, IO] = None,
+                 meta: dict = None, **kwargs):
         if json_data:
-            if not isinstance(json_data, dict):
-                json_data = json.loads(json_data)
-            if json_data:
+            # Dicts (e.g. search hits) are the most common case.
+            if type(json_data) is dict:
                 kwargs.update(json_data)
-
-        self._fields_dict.set(kwargs)
+            else:
+                if hasattr(json_data, 'read'):
+                    # json.load() reads the whole file before parsing it.
+                    json_data = json.load(json_data)
+                elif not isinstance(json_data, dict):
+                    json_data = json.loads(json_data)
+                if json_data:
+                    kwargs.update(json_data)
+
+        # Until the first write the document shares the class-level fields
+        # dict, which is copied by _own_fields_dict() only when necessary.
+        if kwargs:
+            self._own_fields_dict().set(kwargs)
         super().__init__(meta=meta)
 
     def __getattr__(self, item):
         if item not in self._fields_dict:
-            if item in dir(self):
+            cls = type(self)
+            if item in cls._instance_attr_set or item in self.__dict__ \
+                    or hasattr(cls, item):
                 return object.__getattribute__(self, item)
             raise AttributeError(f"There is no field {item} "
                                  f"in the Document of type {type(self)}.")
-        return getattr(self._fields_dict, item)
+        value = getattr(self._fields_dict, item)
+        if isinstance(value, Field):
+            # Nested fields may be changed by the caller, so only the
+            # accessed one is copied instead of the whole fields dict.
+            value = self._own_field(item)
+        return value
 
     def __setattr__(self, key, value):
-        if key.startswith('_') and key in dir(self):
+        cls = type(self)
+        if key.startswith('_') and (key in cls._instance_attr_set
+                                    or key in self.__dict__
+                                    or hasattr(cls, key)):
             return object.__setattr__(self, key, value)
-        setattr(self._fields_dict, key, value)
+        setattr(self._own_fields_dict(), key, value)
 
     def __getitem__(self, item):
-        return self._fields_dict[item]
+        return self._own_fields_dict()[item]
 
     def __setitem__(self, key, value):
-        self._fields_dict[key] = value
+        self._own_fields_dict()[key] = value
 
     def __iter__(self):
-        return self._fields_dict.__iter__()
+        return iter(self._fields_dict._properties)
+
+    def __length_hint__(self):
+        return len(self._fields_dict._properties)
 
     def __dir__(self):
         return object.__dir__(self)
 
     def clean(self):
         """Validates all the fields of the document."""
+        fields_dict = self._own_fields_dict()
         try:
-            return self._fields_dict.clean()
+            return fields_dict.clean()
         except InitializationRequired:
             self.init(self._get_index())
-            return self._fields_dict.clean()
+            return fields_dict.clean()
 
     def full_clean(self):
         return self.clean()
@@ -149,17 +284,8 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
         """Checks whether current document already exists in the database."""
         if 'id' not in self.meta or not self.meta['id']:
             return False
-        try:
-            return bool(self.search().from_dict({
-                "size": 0,
-                "query": {
-                    "match": {
-                        "_id": self.meta['id']
-                    }
-                }
-            }).index(self._get_index()).count())
-        except NotFoundError:
-            return False
+        return self._get_connection().exists(index=self._get_index(),
+                                             id=self.meta['id'])
 
     def set(self, value: dict = None, include_undefined: bool = False,
             **kwargs):
@@ -176,7 +302,8 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
             If False, only fields defined in the model are set.
             If True, creates Text() fields for every undefined key.
         """
-        return self._fields_dict.set(value, include_undefined, **kwargs)
+        return self._own_fields_dict().set(value, include_undefined,
+                                           **kwargs)
 
     def update(self, value: dict = None, include_undefined: bool = False,
                **kwargs):
@@ -191,7 +318,8 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
             If False, only fields defined in the model are set.
             If True, creates Text() fields for every undefined key.
         """
-        return self._fields_dict.update(value, include_undefined, **kwargs)
+        return self._own_fields_dict().update(value, include_undefined,
+                                              **kwargs)
 
     def save(self, validate: bool = True, *args, **kwargs):
         """
@@ -208,13 +336,12 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
             State of the document (created, updated).
         """
         if validate:
-            try:
-                self.clean()
-            except InitializationRequired:
-                self.init(index=self._get_index())
-            else:
-                validate = False
-        if self.timestamp_enabled() and not self.timestamp:
+            # clean() initializes the index itself if it's necessary, so
+            # the document doesn't have to be validated once again by
+            # elasticsearch_dsl.
+            self.clean()
+            validate = False
+        if self._timestamp_enabled and not self.timestamp:
             self.timestamp = datetime.now()
 
         return super().save(validate=validate, *args, **kwargs)
@@ -236,12 +363,14 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
             Document object dictionary representation.
 
         """
-        result = self._fields_dict.serialize()
+        result = self._fields_serializer(self._fields_dict)
         if not include_meta:
             return result
 
-        meta = {"_" + k: self.meta[k] for k in DOC_META_FIELDS if
-                k in self.meta}
+        doc_meta = self.meta
+        meta = {prefixed_name: doc_meta[name]
+                for prefixed_name, name in _PREFIXED_META_FIELDS
+                if name in doc_meta}
 
         index = self._get_index(required=False)
         if index is not None:
@@ -256,15 +385,20 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
     @classmethod
     def bulk_save(cls, docs: list, forced: bool = False,
                   stats_only: bool = False,
-                  using: Union[str, Elasticsearch] = "default"):
+                  using: Union[str, Elasticsearch] = "default",
+                  thread_count: int = None, chunk_size: int = 500,
+                  max_chunk_bytes: int = 100 * 1024 * 1024,
+                  queue_size: int = 4, refresh: Union[bool, str] = False):
         """
         Performs bulk API request to save multiple objects of the model
         at once. Significantly improves saving speed to the db.
+        Chunks of documents are sent in parallel by several threads.
 
         Parameters
         ----------
         docs: list[es_orm.Document]
-            List of Document objects to save in the DB.
+            List (or any other iterable, e.g. generator) of Document objects
+            to save in the DB.
         forced: bool
             Whether passed data should be tried to save to the DB even though
             it's not an instance of the current Model.
@@ -274,6 +408,19 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
             also should return a list of responses of failure requests.
         using: Union[str, Elasticsearch]
             Connection to use for saving data.
+        thread_count: int
+            Amount of threads sending chunks to the DB. Defaults to the
+            number of CPUs.
+        chunk_size: int
+            Amount of documents sent in one request.
+        max_chunk_bytes: int
+            Maximum size of one request in bytes.
+        queue_size: int
+            Size of the task queue between the main thread and the pool of
+            sending threads.
+        refresh: Union[bool, str]
+            Refresh policy of the bulk requests. Pass 'wait_for' to return
+            only when the saved documents become visible to search.
 
         Returns
         -------
@@ -282,41 +429,61 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
             unsuccessful actions.
         """
         es_client = connections.get_connection(using)
-        bulk_data = []
-        bulk_docs = []
-        for doc in docs:
-            doc_representation = str(doc)[:20] + "..." \
-                if len(str(doc)) > 20 else str(doc)
-            if not isinstance(doc, cls) and not forced:
-                print(f"WARNING: {doc_representation} hasn't been saved, "
-                      f"cause it's not an instance of the Document type.")
-                continue
-            try:
-                doc.clean()
-            except InitializationRequired:
-                doc.init(index=doc._get_index())
+        # All the documents of the batch get the same timestamp.
+        now = datetime.now()
+
+        initialized_indices = set()
+
+        # Documents whose actions have been passed to the bulk helper, but
+        # the results haven't been received yet.
+        pending_docs = deque()
+
+        def generate_actions():
+            for doc in docs:
+                if not isinstance(doc, cls) and not forced:
+                    logger.warning("%s hasn't been saved, cause it's not an "
+                                   "instance of the Document type.",
+                                   _short_repr(doc))
+                    continue
+                # The fields are cleaned directly, as Document.clean() would
+                # initialize the index for every document needing it.
+                fields_dict = doc._own_fields_dict()
                 try:
-                    doc.clean()
+                    try:
+                        fields_dict.clean()
+                    except InitializationRequired:
+                        # The mapping of some field has grown and has to be
+                        # updated, which is done once per index in a batch.
+                        doc_index = doc._get_index()
+                        if doc_index not in initialized_indices:
+                            doc.init(index=doc_index, using=es_client)
+                            initialized_indices.add(doc_index)
+                        fields_dict.clean()
                 except ValidationException as error:
-                    print(f"WARNING: {doc_representation} hasn't been saved, "
-                          f"cause it's invalid: {str(error)}")
+                    logger.warning("%s hasn't been saved, cause it's "
+                                   "invalid: %s", _short_repr(doc), error)
                     continue
-            except ValidationException as error:
-                print(f"WARNING: {doc_representation} hasn't been saved, "
-                      f"cause it's invalid: {str(error)}")
-                continue
 
-            if doc.timestamp_enabled() and not doc.timestamp:
-                doc.timestamp = datetime.now()
+                if doc._timestamp_enabled and not doc.timestamp:
+                    doc.timestamp = now
 
-            bulk_data.append(doc.to_dict(True))
-            bulk_docs.append(doc)
+                pending_docs.append(doc)
+                yield doc.to_dict(True)
 
         success, failed = 0, 0
         errors = []
 
-        i = 0
-        for result, item in helpers.streaming_bulk(es_client, bulk_data):
+        # Actions are generated while the previous chunks are being sent,
+        # so the whole batch is never kept in memory. Results of
+        # parallel_bulk keep the order of the actions, so every result
+        # belongs to the oldest pending document.
+        for result, item in helpers.parallel_bulk(
+                es_client, generate_actions(),
+                thread_count=thread_count or os.cpu_count() or 4,
+                chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes,
+                queue_size=queue_size, raise_on_error=False,
+                filter_path=_BULK_FILTER_PATH, refresh=refresh):
+            doc = pending_docs.popleft()
             # go through request-response pairs and detect failures
             if not result:
                 if not stats_only:
@@ -324,11 +491,31 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
                 failed += 1
             else:
                 success += 1
-                bulk_docs[i].meta['id'] = item['index']['_id']
-                bulk_docs[i].meta['index'] = item['index']['_index']
-            i += 1
+                doc.meta['id'] = item['index']['_id']
+                doc.meta['index'] = item['index']['_index']
         return success, failed if stats_only else errors
 
+    @classmethod
+    def from_hits(cls, hits: Union[dict, list]) -> list:
+        """
+        Creates documents from raw search hits, e.g. from the response of
+        the low-level client. It skips wrapping the response into the
+        elasticsearch_dsl Response object, which is costly for big results.
+
+        Parameters
+        ----------
+        hits: Union[dict, list]
+            Either the whole search response or the list of its hits.
+
+        Returns
+        -------
+        list[es_orm.Document]
+            Documents created from the hits.
+        """
+        if isinstance(hits, dict):
+            hits = hits['hits']['hits']
+        return [cls.from_es(hit) for hit in hits]
+
     @classmethod
     def to_field(cls,  **kwargs):
         """
@@ -344,12 +531,122 @@ class Document(DslDocument, metaclass=AdvancedIndexMeta):
 
     @classmethod
     def timestamp_enabled(cls):
-        return hasattr(cls, 'Index') and \
-               hasattr(cls.Index, 'timestamp_enabled') and \
-               cls.Index.timestamp_enabled
+        return cls._timestamp_enabled
+
+    @classmethod
+    def init(cls, index: str = None,
+             using: Union[str, Elasticsearch] = None):
+        super().init(index=index, using=using)
+        cls._cached_mappings.clear()
+
+    @classmethod
+    def set_index_settings(cls, settings: dict, index: str = None,
+                           using: Union[str, Elasticsearch] = None):
+        """
+        Updates dynamic settings of the index. Useful for speeding up
+        loading of many documents, e.g. by passing
+        {"refresh_interval": "30s", "translog.durability": "async"}
+        before the load and restoring the settings after it.
+
+        Parameters
+        ----------
+        settings: dict
+            Settings of the index to update.
+        index: str
+            Name of the index. Defaults to the index of the Document.
+        using: Union[str, Elasticsearch]
+            Connection to use for updating the settings.
+
+        Returns
+        -------
+        dict
+            Response of Elasticsearch.
+        """
+        doc_index = cls._index
+        if index:
+            doc_index = doc_index.clone(name=index)
+        return doc_index.put_settings(using=using, body=settings)
+
+    @classmethod
+    def get_mapping(cls, index: str = None,
+                    using: Union[str, Elasticsearch] = None) -> dict:
+        """
+        Returns the mapping of the index stored in Elasticsearch.
+        The result is cached until the index is initialized by init(), which
+        is also done when the mapping of some field grows during cleaning.
+        Changes of the mapping made in other ways (e.g. dynamic mapping of
+        undefined fields on saving or changes by other processes) aren't
+        reflected, so the result can be stale. A copy of the cached mapping
+        is returned, so it can be changed freely.
+
+        Parameters
+        ----------
+        index: str
+            Name of the index. Defaults to the index of the Document.
+        using: Union[str, Elasticsearch]
+            Connection to use for retrieving the mapping.
+
+        Returns
+        -------
+        dict
+            Mapping of the index, as returned by Elasticsearch.
+        """
+        key = (index, using)
+        result = cls._cached_mappings.get(key)
+        if result is None:
+            doc_index = cls._index
+            if index:
+                doc_index = doc_index.clone(name=index)
+            result = cls._cached_mappings[key] = \
+                doc_index.get_mapping(using=using)
+        return deepcopy(result)
 
     def _from_dict(self, data):
-        return self._fields_dict.deserialize(data, auto_set=True)
+        return self._fields_deserializer(self._own_fields_dict(), data)
+
+    def _own_fields_dict(self):
+        """
+        Returns the fields dict of the current document. Documents share
+        the class-level fields dict until anything is written to them,
+        so it's copied here on the first call.
+        """
+        fields_dict = self._fields_dict
+        class_fields_dict = type(self)._fields_dict
+        if fields_dict is class_fields_dict:
+            fields_dict = self._fields_dict = fields_dict.clone()
+        elif self._fields_partially_shared:
+            class_properties = class_fields_dict._properties
+            properties = fields_dict._properties
+            for name, field_object in properties.items():
+                if field_object is class_properties.get(name):
+                    properties[name] = field_object.clone()
+            self._fields_partially_shared = False
+        return fields_dict
+
+    def _own_field(self, name: str) -> Field:
+        """
+        Returns the field of the current document, copying only this field
+        if it's still shared with the class-level fields dict.
+        """
+        fields_dict = self._fields_dict
+        class_fields_dict = type(self)._fields_dict
+        if fields_dict is class_fields_dict:
+            fields_dict = self._fields_dict = copy(fields_dict)
+            fields_dict._properties = dict(fields_dict._properties)
+            self._fields_partially_shared = True
+        properties = fields_dict._properties
+        field_object = properties[name]
+        if field_object is class_fields_dict._properties.get(name):
+            field_object = properties[name] = field_object.clone()
+        return field_object
+
+
+def _short_repr(doc) -> str:
+    """Returns the shortened string representation of a document."""
+    representation = str(doc)
+    if len(representation) > 20:
+        return representation[:20] + "..."
+    return representation
 
 
 def connect(hosts: Union[str, list], **kwargs) -> client.Elasticsearch:
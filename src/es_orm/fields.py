@@ -1,5 +1,9 @@
+import re
+import sys
 import codecs
 from copy import deepcopy
+from functools import lru_cache
+from types import FunctionType, MappingProxyType
 from typing import Union, Any
 from datetime import datetime
 
@@ -9,6 +13,94 @@ from elasticsearch_dsl.analysis import AnalysisBase
 from .exceptions import ValidationException, InitializationRequired
 from .utils import ConfigClass
 
+# Types whose instances can be safely shared between copies of a field.
+_IMMUTABLE_TYPES = frozenset((type(None), bool, int, float, complex, str,
+                              bytes, frozenset, type, FunctionType,
+                              MappingProxyType))
+
+
+def _copy_value(value, memo: dict):
+    """
+    Deep copies an attribute value of a field. Immutable values are shared,
+    containers of fields are rebuilt directly and everything else falls back
+    to the generic copy.deepcopy().
+    """
+    value_type = type(value)
+    if value_type in _IMMUTABLE_TYPES:
+        return value
+    if isinstance(value, Field):
+        return value.__deepcopy__(memo)
+    if value_type is dict:
+        return {key: _copy_value(item, memo) for key, item in value.items()}
+    if value_type is list:
+        return [_copy_value(item, memo) for item in value]
+    return deepcopy(value, memo)
+
+
+@lru_cache(maxsize=1024)
+def _compile_properties_deserializer(property_names: tuple):
+    """
+    Generates a function deserializing data of a Dict with the passed
+    properties. It does the same as the loop in Dict._deserialize, but
+    accesses every property directly. The function returns None if
+    properties were added to the Dict after the generation.
+
+    Parameters
+    ----------
+    property_names: tuple
+        Names of the properties defined in the Dict.
+
+    Returns
+    -------
+    function
+        Function accepting the properties and the data to deserialize.
+    """
+    lines = ["def deserialize(properties, data):",
+             f"    if len(properties) != {len(property_names)}:",
+             "        return None"]
+    for name in property_names:
+        lines += [f"    if {name!r} in data:",
+                  f"        data[{name!r}] = "
+                  f"properties[{name!r}].deserialize(data[{name!r}])"]
+    lines.append("    return data")
+    namespace = {}
+    exec(compile("\n".join(lines), "<es_orm deserializer>", "exec"),
+         namespace)
+    return namespace['deserialize']
+
+
+def _intern(name):
+    """
+    Interns names of properties, so that the same names coming from
+    different documents are stored once and compared by identity.
+    """
+    if type(name) is str:
+        return sys.intern(name)
+    return name
+
+
+def _repr_item(key: str, value) -> str:
+    """Returns the representation of an item of a field."""
+    if isinstance(value, str):
+        return f'"{key}": "{value}"'
+    return f'"{key}": {value}'
+
+
+# Returned instead of serialized values of fields without values.
+_UNSET = object()
+
+# Types of the values listed in Field.EMPTY_VALUES.
+_EMPTY_VALUE_TYPES = (list, tuple, dict, set, frozenset, str)
+
+
+def _is_empty(value) -> bool:
+    """
+    Checks whether the value is one of Field.EMPTY_VALUES without comparing
+    it with every one of them.
+    """
+    return value is None or (isinstance(value, _EMPTY_VALUE_TYPES)
+                             and not value)
+
 
 class Field:
     """
@@ -70,11 +162,14 @@ class Field:
     _extra_mapping = {}
     _analyzer = None
 
-    _attrs = {}
-    _default_attrs = {
+    # Attributes are never changed in place, but replaced, so fields
+    # without attributes share the empty class-level ones.
+    _attrs = MappingProxyType({})
+    # Read-only, so that the defaults shared by fields can't be changed.
+    _default_attrs = MappingProxyType({
         "pretty_name": "Поле",
         "content_type": "text"
-    }
+    })
 
     def __init__(self,
                  default: Any = None,
@@ -106,37 +201,51 @@ class Field:
         """
         if not isinstance(validation_level, int):
             validation_level = str(validation_level)
-            validation_level = getattr(self.ValidationLevel,
-                                       validation_level, None)
+        validation_level = _VALIDATION_LEVELS.get(validation_level)
 
-        if validation_level not in self.ValidationLevel:
+        if validation_level is None:
             raise ValueError(f'Please provide a valid validation level for '
                              f'the field {self.__class__} (available: '
                              f'{", ".join(self.ValidationLevel.keys())})')
 
-        self._default_attrs = self._default_attrs.copy()
+        # Class-level _default_attrs and _extra_mapping are shared until
+        # the field needs its own values, and they are never changed in place.
         if default_attrs:
             if not isinstance(default_attrs, dict):
                 raise TypeError(f"Default attributes must be an instance of "
                                 f"a dict type, but got {type(default_attrs)} "
                                 f"instead.")
-            self._default_attrs.update(default_attrs or {})
+            self._default_attrs = MappingProxyType({**self._default_attrs,
+                                                    **default_attrs})
 
-        self._attrs = {}
-        self._extra_mapping = dict(self._extra_mapping)
-        self._required = bool(required)
         self._validation_level = validation_level
-        self._attrs_enabled = bool(attrs_enabled)
-        self._default_value = default
+        # Options equal to the class-level ones aren't stored in the instance,
+        # which keeps fields (and their copies) smaller.
+        if bool(required) is not self._required:
+            self._required = bool(required)
+        if bool(attrs_enabled) is not self._attrs_enabled:
+            self._attrs_enabled = bool(attrs_enabled)
+        if default is not self._default_value:
+            self._default_value = default
 
         if analyzer:
             if not hasattr(analyzer, 'get_analysis_definition'):
                 raise TypeError("Incorrect type of the analyzer.")
             self._analyzer = analyzer
-            self._extra_mapping.update(analyzer=self._analyzer.to_dict())
+            self._extra_mapping = {**self._extra_mapping,
+                                   'analyzer': self._analyzer.to_dict()}
 
         if extra_mapping and isinstance(extra_mapping, dict):
-            self._extra_mapping.update(extra_mapping)
+            self._extra_mapping = {**self._extra_mapping, **extra_mapping}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._has_clean = cls._clean is not Field._clean
+        # Default attributes are read-only, so they are shared by copies
+        # of fields instead of being copied.
+        default_attrs = cls.__dict__.get('_default_attrs')
+        if isinstance(default_attrs, dict):
+            cls._default_attrs = MappingProxyType(default_attrs)
 
     def __getitem__(self, item):
         if item == "value":
@@ -156,14 +265,13 @@ class Field:
             raise KeyError(f'There is no "{key}" attribute in the field {self}.')
 
     def __set_name__(self, owner, name):
-        self._default_attrs['pretty_name'] = name
+        self._default_attrs = MappingProxyType({**self._default_attrs,
+                                                'pretty_name': name})
 
     def __eq__(self, other):
         if type(other) is not type(self):
             return False
-        attrs_to_check = [name for name, obj in vars(Field).items()
-                          if not callable(obj) and not name.startswith('__')]
-        for attr in attrs_to_check:
+        for attr in Field._EQ_ATTRS:
             if getattr(self, attr) != getattr(other, attr):
                 return False
         return True
@@ -173,15 +281,68 @@ class Field:
             "value": self.value,
             **self._attrs
         }
-        result = ""
-        for key, value in repr_dict.items():
-            show_value = value
-            if isinstance(value, str):
-                show_value = f'"{value}"'
-            result += f'"{key}": {show_value}, '
-        return f'{self.__class__.__name__}(' \
-               f'{{{result[:-2]}}}' \
-               f')'
+        result = ", ".join([_repr_item(key, value)
+                            for key, value in repr_dict.items()])
+        return f'{self.__class__.__name__}({{{result}}})'
+
+    def __copy__(self):
+        cls = type(self)
+        result = cls.__new__(cls)
+        result_dict = result.__dict__
+        result_dict.update(self.__dict__)
+        return result
+
+    def __deepcopy__(self, memo):
+        copied = memo.get(id(self))
+        if copied is not None:
+            return copied
+        cls = type(self)
+        result = cls.__new__(cls)
+        memo[id(self)] = result
+        result_dict = result.__dict__
+        for name, value in self.__dict__.items():
+            result_dict[name] = _copy_value(value, memo)
+        return result
+
+    def clone(self):
+        """
+        Returns an independent copy of the field. Works just like
+        copy.deepcopy(), but copies known attributes directly instead of
+        using the generic reflective machinery.
+
+        Returns
+        -------
+        Field
+            Copy of the current field.
+        """
+        return self.__deepcopy__({})
+
+    def _clone_for_iteration(self):
+        """
+        Returns a copy of the field which values can be set to, one after
+        another, without affecting the current field. Only the value and
+        attributes of plain fields are changed by setting, so a shallow
+        copy is enough for them. Fields containing other fields have to
+        override it.
+
+        Returns
+        -------
+        Field
+            Copy of the current field.
+        """
+        return self.__copy__()
+
+    def _take_over_mapping(self, other: 'Field'):
+        """
+        Makes the mapping of the field the same as the mapping of its copy,
+        which has grown during cleaning (see ConvertedDict). The mapping of
+        plain fields never grows, so it does nothing for them.
+
+        Parameters
+        ----------
+        other: Field
+            Copy of the current field, created by _clone_for_iteration().
+        """
 
     def clean(self):
         """
@@ -195,19 +356,22 @@ class Field:
             If the validation level is set to STRICT and some of fields
             can't properly validate it's values.
         """
-        if self.value in Field.EMPTY_VALUES:
+        if _is_empty(self.value):
             if self._required:
                 raise ValidationException('В данном поле ожидается значение, '
                                           'но оно осталось пустым.')
             self.value = None
             return
+        if not self._has_clean and isinstance(self.value, self._value_type):
+            # The default _clean() wouldn't change anything.
+            return
         try:
             self._clean()
         except ValidationException as error:
             if self._validation_level == self.ValidationLevel.STRICT:
                 raise error
             elif self._validation_level == self.ValidationLevel.WARNING:
-                self._attrs['warning'] = str(error)
+                self._attrs = {**self._attrs, 'warning': str(error)}
 
     def _clean(self):
         """
@@ -300,7 +464,10 @@ class Field:
         result = {**self._mapping(), **self._extra_mapping}
         if self._attrs_enabled:
             result = {'properties': {'value': result}}
-            for key in {**self._default_attrs, **self._attrs}:
+            attrs = self._default_attrs
+            if self._attrs:
+                attrs = {**attrs, **self._attrs}
+            for key in attrs:
                 result['properties'].update({
                     key: {
                         'type': 'text',
@@ -398,11 +565,10 @@ class Field:
         if include_undefined:
             self._attrs = attrs
         else:
-            result = {}
-            for attr_name in [*self._attrs.keys(), *self._default_attrs.keys()]:
-                if attr_name in attrs:
-                    result.update({attr_name: attrs[attr_name]})
-            self._attrs = result
+            self._attrs = {attr_name: attrs[attr_name]
+                           for attr_name in (*self._attrs,
+                                             *self._default_attrs)
+                           if attr_name in attrs}
 
     def update_attrs(self, attrs: dict = None, include_undefined: bool = False,
                      **kwargs):
@@ -442,18 +608,84 @@ class Field:
         dict
             Serialized value of the field.
         """
-        value = self._serialize()
-        if value in Field.EMPTY_VALUES:
-            if self._default_value in Field.EMPTY_VALUES:
+        return self._wrap_serialized(self._serialize(), include_all_attrs)
+
+    def _wrap_serialized(self, value, include_all_attrs: bool = False):
+        """
+        Puts the default value instead of the empty one and adds
+        SRC attributes to the serialized value.
+
+        Parameters
+        ----------
+        value
+            Value returned by the _serialize method.
+        include_all_attrs: bool
+            Whether the method should also add the default attributes
+            to the resulting dict if not explicitly set by user.
+
+        Returns
+        -------
+        dict
+            Serialized value of the field.
+        """
+        if _is_empty(value):
+            if _is_empty(self._default_value):
                 return None
             value = self._default_value
         if self._attrs_enabled:
             if include_all_attrs:
                 return {'value': value, **self._default_attrs, **self._attrs}
-            else:
+            elif self._attrs:
                 return {'value': value, **self._attrs}
+            return {'value': value}
         return value
 
+    def serialize_batch(self, values: list) -> list:
+        """
+        Serializes several values at once, as if they were set to the field
+        one by one. Neither the value nor the attributes of the current field
+        are changed.
+
+        Parameters
+        ----------
+        values: list
+            Values to serialize.
+
+        Returns
+        -------
+        list
+            Serialized values (without attributes) in the same order.
+        """
+        return self._clone_for_iteration()._serialize_each(values)
+
+    def _serialize_each(self, values: list) -> list:
+        """
+        Does the same as serialize_batch(), but uses the current field
+        for setting values, so its value is changed.
+        """
+        set_value = self.set
+        serialize = self._serialize
+        result = []
+        append = result.append
+        for value in values:
+            set_value(value)
+            append(serialize())
+        return result
+
+    def _serialize_if_set(self):
+        """
+        Serializes the field only if it's value is not empty. Used by
+        dictionaries, which omit fields without values.
+
+        Returns
+        -------
+        object
+            Serialized value of the field or _UNSET if the value is empty.
+        """
+        if _is_empty(self.value):
+            return _UNSET
+        return self.serialize()
+
     def _serialize(self):
         """
         Serializes the field value so that it can be put into Elasticsearch.
@@ -469,6 +701,23 @@ class Field:
         return self.serialize(include_all_attrs)
 
 
+# Attributes compared by Field.__eq__.
+Field._EQ_ATTRS = tuple(name for name, obj in vars(Field).items()
+                        if not callable(obj) and not name.startswith('__'))
+
+# Whether the class overrides Field._clean(). Set for subclasses
+# in Field.__init_subclass__().
+Field._has_clean = False
+
+# Validation levels by their names and values.
+_VALIDATION_LEVELS = {
+    **{level: level for level in (getattr(Field.ValidationLevel, name)
+                                  for name in Field.ValidationLevel.keys())},
+    **{name: getattr(Field.ValidationLevel, name)
+       for name in Field.ValidationLevel.keys()},
+}
+
+
 class Dict(Field):
     """
     Implements a dict functionality as well as an ability to work with
@@ -490,12 +739,16 @@ class Dict(Field):
     __is_properties_defined: bool
         If False, the properties of the Dict object wasn't defined during
         initialization, thus they will be added dynamically during setting.
+    _deserializer: function
+        Function generated for deserializing the properties defined during
+        initialization.
     """
     _value_type = dict
     _es_type = "object"
 
     _properties = {}
     _inner_attrs_enabled = False
+    _deserializer = None
     __is_properties_defined = True
 
     def __init__(self, properties: dict = None,
@@ -503,24 +756,39 @@ class Dict(Field):
         self._properties = {}
         self._inner_attrs_enabled = bool(inner_attrs_enabled)
 
-        if properties not in Field.EMPTY_VALUES:
+        if not _is_empty(properties):
             if not isinstance(properties, dict):
                 raise TypeError(f"Properties of the Dict object must be "
                                 f"a dict of Field objects, but got "
                                 f"{type(properties)} instead.")
-            self._properties = {name: properties[name] for name in properties
-                                if isinstance(properties[name], Field)}
+            self._properties = {}
+            for name, property_object in properties.items():
+                # Field classes are accepted just like in List.
+                if isinstance(property_object, type) and \
+                        issubclass(property_object, Field):
+                    property_object = property_object()
+                if isinstance(property_object, Field):
+                    self._properties[_intern(name)] = property_object
             if not self._inner_attrs_enabled:
                 for property_object in self._properties.values():
                     property_object._attrs_enabled = False
 
         if not self._properties:
             self.__is_properties_defined = False
+        else:
+            self._deserializer = _compile_properties_deserializer(
+                tuple(self._properties))
         super().__init__(**kwargs)
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._class_attr_names = frozenset(dir(cls))
+
     def __getattr__(self, item):
         if item not in self._properties:
-            if item == 'value' or (item.startswith('_') and item in dir(self)):
+            if item == 'value' or (item.startswith('_') and (
+                    item in type(self)._class_attr_names
+                    or item in self.__dict__)):
                 return super().__getattribute__(item)
             raise AttributeError(f"There is no property {item} "
                                  f"in the dict.")
@@ -529,7 +797,9 @@ class Dict(Field):
         return self._properties[item].value
 
     def __setattr__(self, key, value):
-        if key == "value" or (key.startswith('_') and key in dir(self)):
+        if key == "value" or (key.startswith('_') and (
+                key in type(self)._class_attr_names
+                or key in self.__dict__)):
             return super().__setattr__(key, value)
         if self._properties and key in self._properties:
             return self._properties[key].set(value)
@@ -542,29 +812,24 @@ class Dict(Field):
         return self._properties[key].set(value)
 
     def __iter__(self):
-        for property_name in self._properties.keys():
-            yield property_name
+        return iter(self._properties)
+
+    def __length_hint__(self):
+        return len(self._properties)
 
     def __repr__(self):
-        repr_dict = {
-            **self._attrs
-        }
-        result = '"value": {...}, '
-        for key, value in repr_dict.items():
-            show_value = value
-            if isinstance(value, str):
-                show_value = f'"{value}"'
-            result += f'"{key}": {show_value}, '
-        return f'{self.__class__.__name__}(' \
-               f'{{{result[:-2]}}}' \
-               f')'
+        result = ", ".join(['"value": {...}',
+                            *[_repr_item(key, value)
+                              for key, value in self._attrs.items()]])
+        return f'{self.__class__.__name__}({{{result}}})'
 
     @property
     def value(self):
         result = {}
         for property_name, property_object in self._properties.items():
-            if property_object.value not in Field.EMPTY_VALUES:
-                result.update({property_name: property_object.serialize()})
+            serialized = property_object._serialize_if_set()
+            if serialized is not _UNSET:
+                result[property_name] = serialized
         return result
 
     @value.setter
@@ -576,6 +841,25 @@ class Dict(Field):
         new_value.update(value or {})
         self.update(new_value, include_undefined=True)
 
+    def _clone_for_iteration(self):
+        # Values are set to the properties, so they have to be copied too.
+        return self.clone()
+
+    def _take_over_mapping(self, other: 'Dict'):
+        other_properties = other._properties
+        for property_name, property_object in self._properties.items():
+            if property_name in other_properties:
+                property_object._take_over_mapping(
+                    other_properties[property_name])
+
+    def _serialize_if_set(self):
+        # The value of a Dict is built from serialized properties, so it's
+        # not built once again by serialize().
+        value = self.value
+        if _is_empty(value):
+            return _UNSET
+        return self._wrap_serialized(value)
+
     def _mapping(self):
         result = {}
         for property_name, property_object in self._properties.items():
@@ -589,15 +873,28 @@ class Dict(Field):
         if value and not isinstance(value, dict):
             raise TypeError(f"Value must be an instance of dict type, but "
                             f"got {type(value)}")
-        if value and not include_undefined:
-            new_value = value
-            if self._attrs_enabled and 'value' in value:
-                new_value = value['value']
-            for property_name in list(new_value.keys()):
-                if property_name not in self._properties:
-                    new_value.pop(property_name)
-        super().set(value)
-        self.update(include_undefined=include_undefined, **kwargs)
+        new_value = value
+        if self._attrs_enabled and value and 'value' in value:
+            new_value = value.pop('value')
+            self._attrs = value
+        if new_value and not isinstance(new_value, dict):
+            raise TypeError(f"Value must be an instance of dict type, but "
+                            f"got {type(new_value)}")
+        if not new_value:
+            new_value = {}
+
+        # Properties missing in the new value are cleared, and the undefined
+        # ones are added in the same pass.
+        properties = self._properties
+        for property_name, property_object in properties.items():
+            property_object.set(new_value.get(property_name))
+        if include_undefined:
+            for property_name, property_value in new_value.items():
+                if property_name not in properties:
+                    self.__add_undefined_property(property_name,
+                                                  property_value)
+        if kwargs:
+            self.update(kwargs, include_undefined=include_undefined)
 
     def update(self, value: dict = None, include_undefined: bool = False,
                **kwargs):
@@ -701,19 +998,30 @@ class Dict(Field):
             yield property_object.value
 
     def _clean(self):
-        error_message = ""
+        errors = []
         for property_name, property_object in self._properties.items():
+            # Cleaning of unset properties which aren't required wouldn't
+            # change anything, so it's skipped. The value of properties
+            # having it computed (like Dict) isn't checked, as it's costly.
+            if type(property_object).value is None and \
+                    property_object.value is None and \
+                    not property_object._required:
+                continue
             try:
                 property_object.clean()
             except ValidationException as error:
-                error_message += f"Поле {property_name} не было " \
-                                 f"успешно валидировано: {error}. "
-        if error_message:
-            raise ValidationException(error_message)
+                errors.append(f"Поле {property_name} не было "
+                              f"успешно валидировано: {error}. ")
+        if errors:
+            raise ValidationException("".join(errors))
 
     def _deserialize(self, data: dict):
         if not data:
             return None
+        if self._deserializer and type(data) is dict:
+            result = self._deserializer(self._properties, data)
+            if result is not None:
+                return result
         for key, value in data.items():
             if key not in self._properties:
                 continue
@@ -737,7 +1045,29 @@ class Dict(Field):
         else:
             new_property = Text(attrs_enabled=self._inner_attrs_enabled)
             new_property.set(value)
-        self._properties[key] = new_property
+        self._properties[_intern(key)] = new_property
+
+
+# Used by Dict instead of dir() calls while getting and setting attributes.
+Dict._class_attr_names = frozenset(dir(Dict))
+
+
+def _format_datetime(value: datetime) -> str:
+    """Returns the same string as value.isoformat(), but faster."""
+    if value.tzinfo is not None:
+        return value.isoformat()
+    if value.microsecond:
+        return '%04d-%02d-%02dT%02d:%02d:%02d.%06d' % (
+            value.year, value.month, value.day, value.hour,
+            value.minute, value.second, value.microsecond)
+    return '%04d-%02d-%02dT%02d:%02d:%02d' % (
+        value.year, value.month, value.day,
+        value.hour, value.minute, value.second)
+
+
+# Exactly the strings _format_datetime() returns for naive datetime objects.
+_NAIVE_ISO_DATETIME = re.compile(
+    r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{6})?')
 
 
 class Date(Field):
@@ -765,9 +1095,15 @@ class Date(Field):
         super().__init__(*args, **kwargs)
 
     def _serialize(self):
-        if not isinstance(self.value, datetime):
-            return str(self.value)
-        return self.value.isoformat()
+        value = self.value
+        if not isinstance(value, datetime):
+            return str(value)
+        return _format_datetime(value)
+
+    def _serialize_each(self, values: list) -> list:
+        if all(type(value) is datetime for value in values):
+            return [_format_datetime(value) for value in values]
+        return super()._serialize_each(values)
 
     def _deserialize(self, data):
         if isinstance(data, int):
@@ -775,6 +1111,11 @@ class Date(Field):
         if self._date_format:
             data = datetime.strptime(str(data), self._date_format)
         else:
+            # Dates saved by the field itself are parsed much faster by
+            # the datetime. Other formats (including ones with time zones)
+            # are left to dateutil, so the results don't change.
+            if type(data) is str and _NAIVE_ISO_DATETIME.fullmatch(data):
+                return datetime.fromisoformat(data)
             data = parser.parse(str(data))
         return data
 
@@ -788,14 +1129,18 @@ class Choices(Field):
     ----------
     _field_class: Field
         Field class used to create mapping in Elasticsearch.
-    _choices: list
-        List of values which are allowed to put into the database.
+    _choices: tuple
+        Values which are allowed to put into the database.
+    _choices_set: frozenset
+        The same values used for fast checks. None if some of the values
+        are unhashable.
     """
     _value_type = object
     _es_type = "text"
 
     _field_class = None
-    _choices = []
+    _choices = ()
+    _choices_set = None
 
     def __init__(self, choices: Union[list, tuple, set],
                  field_class: Field = None, *args, **kwargs):
@@ -808,11 +1153,26 @@ class Choices(Field):
             field_class = field_class()
 
         self._field_class = field_class
-        self._choices = choices
+        # Stored as a tuple, so that it can't be changed afterwards
+        # and is shared by copies of the field.
+        self._choices = tuple(choices)
+        try:
+            self._choices_set = frozenset(self._choices)
+        except TypeError:
+            self._choices_set = None
         super().__init__(*args, **kwargs)
 
+    def __deepcopy__(self, memo):
+        memo[id(self._choices)] = self._choices
+        return super().__deepcopy__(memo)
+
     def _clean(self):
-        if self.value not in self._choices:
+        try:
+            is_allowed = self.value in self._choices_set
+        except TypeError:
+            # Either the value or some of the choices are unhashable.
+            is_allowed = self.value in self._choices
+        if not is_allowed:
             raise ValidationException('Значение поля не находится в списке '
                                       'допустимых.')
 
@@ -852,36 +1212,120 @@ class List(Field):
         super().__init__(*args, **kwargs)
 
     def _clean(self):
-        if not isinstance(self.value, list):
+        value = self.value
+        # Exact type is checked first, as subclasses are rarely used.
+        if type(value) is not list and not isinstance(value, list):
             raise ValidationException("Значение поля не является списком.")
-        element_object = deepcopy(self._element_object)
-        for i, element in enumerate(self.value):
+        element_object = self._element_object
+        value_type = element_object._value_type
+        if not element_object._has_clean and value_type is not dict and \
+                all(type(element) is value_type and element
+                    for element in value):
+            # Cleaning of non-empty elements of the exact type wouldn't
+            # change or reject anything.
+            return
+        # Elements are set to one copy of the element object one by one.
+        element_object = self._element_object._clone_for_iteration()
+        set_element = element_object.set
+        clean_element = element_object.clean
+        for i, element in enumerate(value):
             try:
-                element_object.set(element)
+                set_element(element)
             except Exception as error:
                 raise ValidationException(f"Не удалось проверить элемент "
                                           f"{element} списка: {error}.")
             try:
-                element_object.clean()
-                self.value[i] = element_object.value
+                clean_element()
+                value[i] = element_object.value
             except ValidationException as error:
                 raise ValidationException(f"Не удалось валидировать элемент "
                                           f"{element} списка: {error}.")
+            except InitializationRequired:
+                # The mapping of the List is built from the element object,
+                # so it has to grow along with the copy.
+                self._element_object._take_over_mapping(element_object)
+                raise
 
     def _mapping(self):
         return self._element_object._mapping()
 
     def _serialize(self):
-        if not isinstance(self.value, list):
-            return str(self.value)
+        value = self.value
+        if type(value) is not list and not isinstance(value, list):
+            return str(value)
 
-        element_object = deepcopy(self._element_object)
-        result = []
-        for element in self.value:
-            element_object.set(element)
-            result.append(element_object._serialize())
+        return self._element_object.serialize_batch(value)
 
-        return result
+    def _take_over_mapping(self, other: 'List'):
+        self._element_object._take_over_mapping(other._element_object)
+
+
+def _convert_dict(data: dict) -> list:
+    """
+    Converts a dict to the form in that doesn't leads
+    to the mapping explosion. Recursive.
+
+    Parameters
+    ----------
+    data: dict
+        Dictionary to convert.
+
+    Returns
+    -------
+    list
+        Converted dictionary.
+    """
+    return [{'key': key, 'inner_dict': _convert_dict(value)}
+            if isinstance(value, dict) else {'key': key, 'value': value}
+            for key, value in data.items()]
+
+
+def _deconvert_dict(data: list) -> dict:
+    """
+    Deconverts a dict from the form which doesn't cause mapping explosion.
+    Recursive.
+
+    Parameters
+    ----------
+    data: list
+        Dict that was converted using _convert_dict before.
+
+    Returns
+    ----------
+    dict
+        Deconverted dictionary.
+    """
+    if not data or not isinstance(data, list):
+        return data if not isinstance(data, dict) or \
+                       'value' not in data else data['value']
+    result = {}
+    for pair in data:
+        # Every pair has to contain the key and either the value
+        # or the inner dict.
+        has_value = 'value' in pair
+        if has_value is ('inner_dict' in pair) or 'key' not in pair:
+            raise ValueError('Incorrect structure of converted dict.')
+        if has_value:
+            result[pair['key']] = pair['value']
+        else:
+            result[pair['key']] = _deconvert_dict(pair['inner_dict'])
+    return result
+
+
+@lru_cache(maxsize=64)
+def _converted_dict_mapping(depth: int) -> 'Dict':
+    """
+    Returns the Dict representing the mapping of converted dicts with the
+    passed depth. The result is cached and shared by all the ConvertedDict
+    objects, so it mustn't be changed.
+    """
+    new_mapping = {
+        "key": Text(),
+        "value": Text(),
+    }
+    if depth > 1:
+        new_mapping["inner_dict"] = _converted_dict_mapping(depth - 1)
+    return Dict(properties=new_mapping, attrs_enabled=False)
 
 
 class ConvertedDict(Field):
@@ -910,18 +1354,25 @@ class ConvertedDict(Field):
         self.__update_mapping(1)
         super().__init__(*args, **kwargs)
 
+    def __deepcopy__(self, memo):
+        # The mapping is shared, so it's never copied.
+        memo[id(self._properties)] = self._properties
+        return super().__deepcopy__(memo)
+
     def _clean(self):
         super()._clean()
-        if not isinstance(self.value, dict):
+        value = self.value
+        if type(value) is not dict and not isinstance(value, dict):
             raise ValidationException('Значение поля не является словарем.')
         is_mapping_changed = self.__update_mapping()
         if is_mapping_changed:
             raise InitializationRequired()
 
     def _serialize(self):
-        if isinstance(self.value, dict):
-            return self.__convert_dict(self.value)
-        return {'value': str(self.value)}
+        value = self.value
+        if type(value) is dict or isinstance(value, dict):
+            return _convert_dict(value)
+        return {'value': str(value)}
 
     def deserialize(self, data: object, auto_set: bool = False):
         result = super().deserialize(data, auto_set)
@@ -930,73 +1381,49 @@ class ConvertedDict(Field):
         return result
 
     def _deserialize(self, data: list):
-        return self.__deconvert_dict(data)
+        return _deconvert_dict(data)
+
+    def _take_over_mapping(self, other: 'ConvertedDict'):
+        if other.__depth > self.__depth:
+            self._properties = other._properties
+            self.__depth = other.__depth
 
     def _mapping(self):
         return self._properties.mapping()
 
-    def __convert_dict(self, data: dict):
+    def __determine_depth(self, data: dict, limit: int = None) -> int:
         """
-        Converts a dict to the form in that doesn't leads
-        to the mapping explosion. Recursive.
+        Returns the depth of the passed dictionary. Empty dictionaries
+        and other values don't add any depth.
 
         Parameters
         ----------
         data: dict
-            Dictionary to convert.
+            Dictionary to determine the depth of.
+        limit: int
+            If passed, dictionaries deeper than the limit aren't inspected,
+            and the limit is returned as soon as it's reached.
 
         Returns
         -------
-        list
-            Converted dictionary.
-        """
-        new_data = []
-        for key, value in data.items():
-            if isinstance(value, dict):
-                value = self.__convert_dict(value)
-                new_data.append({'key': key, 'inner_dict': value})
-            else:
-                new_data.append({'key': key, 'value': value})
-        return new_data
-
-    def __deconvert_dict(self, data: list) -> dict:
-        """
-        Deconverts a dict from the form which doesn't cause mapping explosion.
-        Recursive.
-
-        Parameters
-        ----------
-        data: list
-            Dict that was converted using __convert_dict before.
-
-        Returns
-        ----------
-        dict
-            Deconverted dictionary.
+        int
+            Depth of the dictionary.
         """
-        if not data or not isinstance(data, list):
-            return data if not isinstance(data, dict) or \
-                           'value' not in data else data['value']
-        result = {}
-        for pair in data:
-            if ('value' in pair and 'inner_dict' in pair) or \
-                    ('value' not in pair and 'inner_dict' not in pair) \
-                    or 'key' not in pair:
-                raise ValueError('Incorrect structure of converted dict.')
-            if 'value' in pair:
-                result[pair['key']] = pair['value']
-            elif 'inner_dict' in pair:
-                result[pair['key']] = self.__deconvert_dict(pair['inner_dict'])
+        if not isinstance(data, dict) or not data:
+            return 0
+        result = 0
+        stack = [(data, 1)]
+        while stack:
+            value, depth = stack.pop()
+            if depth > result:
+                result = depth
+                if result == limit:
+                    return result
+            stack.extend((inner_value, depth + 1)
+                         for inner_value in value.values()
+                         if inner_value and isinstance(inner_value, dict))
         return result
 
-    def __determine_depth(self, data: dict) -> int:
-        """
-        Returns the depth of the passed dictionary.
-        """
-        if isinstance(data, dict) and data:
-            return 1 + (max(map(self.__determine_depth, data.values())) if data else 0)
-        return 0
-
     def __update_mapping(self, depth: int = None):
         """
         Updates index mapping in accordance with the depth of current dict.
@@ -1014,22 +1441,16 @@ class ConvertedDict(Field):
         """
         current_depth = depth
         if not depth:
-            current_depth = self.__determine_depth(self.value)
+            # Checking whether the depth grows doesn't require going deeper
+            # than the next level, so the whole dict is walked only if it does.
+            current_depth = self.__determine_depth(self.value,
+                                                   self.__depth + 1)
+            if current_depth > self.__depth:
+                current_depth = self.__determine_depth(self.value)
         if self.__depth >= current_depth:
             return False
 
-        new_mapping = {
-            "key": Text(),
-            "value": Text(),
-        }
-        for i in range(current_depth-1):
-            new_mapping = {
-                "key": Text(),
-                "value": Text(),
-                "inner_dict": Dict(properties=new_mapping,
-                                   attrs_enabled=False),
-            }
-        self._properties = Dict(properties=new_mapping, attrs_enabled=False)
+        self._properties = _converted_dict_mapping(current_depth)
         self.__depth = current_depth
         return True
 
@@ -1039,13 +1460,24 @@ class InnerDocument(Field):
     Used to define dictionaries as classes.
     The definition of these classes doesn't differ from definition
     of Document classes, apart from defining the Index class inside.
+
+    Attributes
+    ----------
+    _field_names: tuple
+        Names of the Field attributes of the class, collected once
+        during the class creation.
     """
+    _field_names = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_names = tuple(attr for attr in dir(cls)
+                                 if isinstance(getattr(cls, attr), Field))
+
     @classmethod
     def to_field(cls, **kwargs):
-        dict_properties = {}
-        for attr in dir(cls):
-            if isinstance(getattr(cls, attr), Field):
-                dict_properties[attr] = getattr(cls, attr)
+        dict_properties = {attr: getattr(cls, attr)
+                           for attr in cls._field_names}
         return Dict(properties=dict_properties, **kwargs)
 
     def __new__(cls, *args, **kwargs):
@@ -1068,7 +1500,13 @@ class DocumentDict(Dict):
             raise TypeError('Properties must be an instance of the dict type.')
         combined_properties = {}
         if document_class:
-            combined_properties.update(deepcopy(document_class._fields_dict))
+            # Properties are changed by the Dict, so they are copied, but
+            # the Dict object of the document itself isn't needed here.
+            memo = {}
+            combined_properties = {
+                name: property_object.__deepcopy__(memo)
+                for name, property_object
+                in document_class._fields_dict._properties.items()}
         combined_properties.update(properties or {})
         self._document_class = document_class
         super().__init__(properties=combined_properties, **kwargs)
@@ -1091,8 +1529,11 @@ class Bytes(Field):
 
     def _serialize(self):
         data = self.value
-        if not isinstance(data, bytes):
+        if type(data) is not bytes and not isinstance(data, bytes):
             data = str(data)
+        if data.isascii():
+            # Nothing to escape, so the data is decoded in a single pass.
+            return data if isinstance(data, str) else data.decode("ascii")
         if isinstance(data, str):
             data = data.encode("ascii", "backslashreplace")
         return data.decode("ascii", "backslashreplace")
@@ -1117,6 +1558,8 @@ class ForeignKey(Field):
     __foreign_key_object: Document
         Document object associated with another foreign document,
         in another index.
+    __foreign_key_id: str
+        ID the __foreign_key_object was retrieved with.
     """
     _value_type = str
     _es_type = "text"
@@ -1124,6 +1567,7 @@ class ForeignKey(Field):
     _foreign_doc_type = None
     _ref_property = None
     __foreign_key_object = None
+    __foreign_key_id = None
 
     def __init__(self, foreign_doc_type, ref_property: str = None,
                  *args, **kwargs):
@@ -1154,14 +1598,15 @@ class ForeignKey(Field):
         if not foreign_key_id:
             raise ValueError(
                 f"You have to set foreign key id before accessing it.")
-        if not hasattr(self, '__foreign_key_object') or \
-                not self.__foreign_key_object or  \
-                self.__foreign_key_object.meta['id'] != foreign_key_id:
-            self.__foreign_key_object = self._foreign_doc_type(
-                meta={'id': foreign_key_id})
-            if self.__foreign_key_object.exists():
-                self.__foreign_key_object = self._foreign_doc_type().get(
-                    id=foreign_key_id)
+        if self.__foreign_key_object is None or \
+                self.__foreign_key_id != foreign_key_id:
+            foreign_key_object = self._foreign_doc_type.get(
+                id=foreign_key_id, ignore=404)
+            if foreign_key_object is None:
+                foreign_key_object = self._foreign_doc_type(
+                    meta={'id': foreign_key_id})
+            self.__foreign_key_object = foreign_key_object
+            self.__foreign_key_id = foreign_key_id
         return self.__foreign_key_object
 
 
@@ -1,10 +1,17 @@
 class ConfigClassMeta(type):
     """
     Makes it possible to use the "in" operator with classes.
+    Names of the public attributes are collected once during the class
+    creation and stored in the _public_attrs attribute.
     """
+    def __init__(cls, name, bases, namespace, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+        cls._public_attrs = tuple(attr for attr in dir(cls)
+                                  if not attr.startswith("__")
+                                  and attr != '_public_attrs')
+
     def __iter__(self):
-        return (getattr(self, attr) for attr in dir(self)
-                if not attr.startswith("__"))
+        return (getattr(self, attr) for attr in self._public_attrs)
 
 
 class ConfigClass(metaclass=ConfigClassMeta):
@@ -15,9 +22,9 @@ class ConfigClass(metaclass=ConfigClassMeta):
     @classmethod
     def keys(cls):
         return (attr for attr, attr_obj in vars(cls).items()
-                if not attr.startswith('__') and not callable(attr_obj))
+                if not attr.startswith('__') and not callable(attr_obj)
+                and attr != '_public_attrs')
 
     @classmethod
     def values(cls):
-        return (getattr(cls, attr) for attr in dir(cls)
-                if not attr.startswith('__'))
+        return (getattr(cls, attr) for attr in cls._public_attrs)
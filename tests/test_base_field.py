@@ -1,7 +1,8 @@
+from copy import copy
 from unittest import TestCase
 
 from src.es_orm import Document
-from src.es_orm.fields import Dict, Field, Text
+from src.es_orm.fields import Dict, Field, Text, _is_empty
 from src.es_orm.exceptions import ValidationException
 
 
@@ -32,6 +33,9 @@ class BaseFieldTest(TestCase):
         self.assertRaises(ValueError, Field, validation_level=3)
         self.assertRaises(ValueError, Field, validation_level="1")
         self.assertRaises(ValueError, Field, validation_level="VERY STRICT")
+        self.assertRaises(ValueError, Field, validation_level="_public_attrs")
+        self.assertEqual(list(Field.ValidationLevel.keys()),
+                         ['STRICT', 'WARNING', 'DISABLED'])
 
     def test_init_with_different_default_attrs(self):
         test_field = Field(default_attrs={})
@@ -56,6 +60,17 @@ class BaseFieldTest(TestCase):
 
         self.assertEqual(Field._default_attrs,
                          {"pretty_name": "Поле", "content_type": "text"})
+        self.assertIs(test_field.clone()._default_attrs,
+                      test_field._default_attrs)
+
+        class TestField(Field):
+            _default_attrs = {"pretty_name": "Тест"}
+
+        with self.assertRaises(TypeError):
+            TestField._default_attrs["pretty_name"] = "123"
+        self.assertEqual(TestField(default_attrs={'123': '123'})
+                         ._default_attrs,
+                         {"pretty_name": "Тест", "123": "123"})
 
     def test_init_with_different_attrs_enabled(self):
         test_object = Field(attrs_enabled=True)
@@ -308,6 +323,7 @@ class BaseFieldTest(TestCase):
         test_field.clean()
         self.assertTrue('warning' in test_field._attrs)
         self.assertEqual(test_field.value, "test")
+        self.assertEqual(Field._attrs, {})
 
     def test_clean_with_disabled_validation(self):
         test_field = Field(validation_level=Field.ValidationLevel.DISABLED)
@@ -391,4 +407,36 @@ class BaseFieldTest(TestCase):
                          })
 
     def test_updating_of_attrs(self):
-        pass
\ No newline at end of file
+        pass
+
+    def test_empty_values(self):
+        for value in Field.EMPTY_VALUES:
+            self.assertTrue(_is_empty(value))
+        for value in [0, False, 0.0, b"", "0", [None], {"value": None}]:
+            self.assertFalse(_is_empty(value))
+
+    def test_copy(self):
+        test_object = Text(default_attrs={'test': 'value'})
+        test_object.set("test")
+        copied_object = copy(test_object)
+        self.assertIsNot(copied_object, test_object)
+        self.assertEqual(copied_object.serialize(), test_object.serialize())
+
+        copied_object.set("changed")
+        copied_object.update_attrs({'test': 'changed'})
+        self.assertEqual(test_object.value, "test")
+        self.assertEqual(test_object._attrs, {})
+
+    def test_mapping_not_shared(self):
+        mapping = Text(attrs_enabled=False).mapping()
+        mapping['fields']['keyword']['ignore_above'] = 1
+        self.assertEqual(
+            Text(attrs_enabled=False).mapping()['fields']['keyword'],
+            {'type': 'keyword', 'ignore_above': 256})
+
+        mapping = Text().mapping()
+        mapping['properties']['pretty_name']['type'] = 'keyword'
+        attrs_mapping = Text().mapping()['properties']
+        self.assertEqual(attrs_mapping['pretty_name']['type'], 'text')
+        self.assertIsNot(attrs_mapping['pretty_name'],
+                         attrs_mapping['content_type'])
\ No newline at end of file
@@ -1,6 +1,5 @@
 import os
 import unittest
-from time import sleep
 
 import elasticsearch_dsl
 
@@ -16,7 +15,12 @@ class DBInteractionTests(unittest.TestCase):
         if not es_host:
             raise EnvironmentError('Please provide ES_HOST environment '
                                    'variable to start unittesting.')
-        connect(es_host)
+        # The connection created by the tests package is shared by the whole
+        # session, so its pool of keep-alive connections isn't recreated.
+        try:
+            elasticsearch_dsl.connections.get_connection()
+        except KeyError:
+            connect(es_host)
 
         class TestStrictClass(Document):
             array = List()
@@ -30,9 +34,9 @@ class DBInteractionTests(unittest.TestCase):
                 name = 'test_db_interaction_index'
 
         cls.test_class = TestStrictClass
-        if elasticsearch_dsl.Index(cls.test_class.Index.name).exists():
-            elasticsearch_dsl.Index(cls.test_class.Index.name).delete()
-        elasticsearch_dsl.Index(cls.test_class.Index.name).create()
+        test_index = elasticsearch_dsl.Index(cls.test_class.Index.name)
+        test_index.delete(ignore=[400, 404])
+        test_index.create()
 
     @classmethod
     def tearDownClass(cls) -> None:
@@ -205,7 +209,9 @@ class DBInteractionTests(unittest.TestCase):
                                     'type': 'text'},
                             }
                         }}}}}
-        self.assertEqual(expected_mapping, new_document._index.get_mapping())
+        self.assertEqual(expected_mapping, self.test_class.get_mapping())
+        self.test_class.get_mapping().clear()
+        self.assertEqual(expected_mapping, self.test_class.get_mapping())
 
     def test_save_and_retrieve_data(self):
         test_data = {
@@ -218,8 +224,7 @@ class DBInteractionTests(unittest.TestCase):
         new_document = self.test_class(**test_data)
 
         try:
-            new_document.save()
-            sleep(1)
+            new_document.save(refresh='wait_for')
         except Exception as error:
             self.fail(str(error.args))
 
@@ -227,6 +232,21 @@ class DBInteractionTests(unittest.TestCase):
         db_document.full_clean()
         self.assertEqual(new_document, db_document)
 
+    def test_bulk_save_and_retrieve_data(self):
+        new_documents = [self.test_class(array=[i], integer=i,
+                                         text=f"Text message {i}",
+                                         choices="1 option")
+                         for i in range(3)]
+
+        self.assertEqual(self.test_class.bulk_save(new_documents),
+                         (len(new_documents), []))
+
+        db_documents = self.test_class.mget(
+            [new_document.meta.id for new_document in new_documents])
+        for new_document, db_document in zip(new_documents, db_documents):
+            db_document.full_clean()
+            self.assertEqual(new_document, db_document)
+
     def test_update_document(self):
         test_data = {
             "array": [1, 2, 3],
@@ -253,8 +273,7 @@ class DBInteractionTests(unittest.TestCase):
         new_document.set(**new_data)
 
         new_document.clean()
-        db_document.save()
-        sleep(2)
+        db_document.save(refresh='wait_for')
         db_document = self.test_class.get(id=new_document.meta.id)
 
         self.assertEqual(db_document, new_document)
@@ -19,6 +19,9 @@ class TestDictField(TestCase):
         })
         self.assertEqual(list(test_object._properties.keys()),
                          ["text", "field"])
+        test_object = Dict(properties={"text": Text, "wrong": str})
+        self.assertEqual(list(test_object._properties.keys()), ["text"])
+        self.assertEqual(type(test_object['text']), Text)
 
     def test_init_with_invalid_data(self):
         self.assertRaises(TypeError, Dict, properties="1")
@@ -104,6 +107,13 @@ class TestDictField(TestCase):
         test_object.set({"test": 1234, "test2": 321}, include_undefined=True)
         self.assertEqual(test_object.value, {"test": 1234, "test2": 321})
 
+    def test_set_keeps_passed_data(self):
+        test_object = Dict(properties={"test": Text()})
+        data = {"test": 123, "test2": 321}
+        test_object.set(data)
+        self.assertEqual(test_object.value, {"test": 123})
+        self.assertEqual(data, {"test": 123, "test2": 321})
+
     def test_work_with_square_brackets(self):
         test_object = Dict(properties={'text': Text()})
         test_object['text'] = 10
@@ -191,6 +201,22 @@ class TestDictField(TestCase):
         test_object.set({'test': 123, 'test2': 321})
         self.assertEqual(list(test_object.values()), [123, 321])
 
+    def test_clean_unset_properties(self):
+        test_object = Dict(properties={
+            'test': Text(),
+            'required': Text(required=True),
+            'dict': Dict(properties={"test": Text(required=True),
+                                     "test2": Text()})
+        })
+        test_object.set({'required': 'test'})
+        test_object.clean()
+
+        test_object.set({'required': 'test', 'dict': {'test2': 'test'}})
+        self.assertRaises(ValidationException, test_object.clean)
+
+        test_object.set({'dict': {'test': 'test'}})
+        self.assertRaises(ValidationException, test_object.clean)
+
     def test_clean(self):
         test_object = Dict(properties={
             'test': Field(),
@@ -242,7 +268,32 @@ class TestDictField(TestCase):
         self.assertTrue('test' in test_object._attrs['warning'])
         self.assertTrue('dict' in test_object._attrs['warning'])
 
+    def test_deserialize(self):
+        test_object = Dict(properties={"test": Text(),
+                                       "inner": Dict(properties={
+                                           "test": Text()})})
+        self.assertEqual(test_object.deserialize(
+            {"value": {"test": "1", "inner": {"test": "2"},
+                       "undefined": 3}}),
+            {"test": "1", "inner": {"test": "2"}, "undefined": 3})
+        self.assertEqual(test_object.deserialize({"value": None}), None)
+
+        test_object.undefined = "test"
+        self.assertEqual(test_object.deserialize(
+            {"value": {"test": "1", "undefined": 3}}),
+            {"test": "1", "undefined": "3"})
+
+    def test_clone(self):
+        test_object = Dict(properties={
+            'test': Text(),
+            'dict': Dict(properties={"test": Text()})
+        })
+        test_object.set({'test': 123, 'dict': {'test': 321}})
+        cloned_object = test_object.clone()
+        self.assertEqual(cloned_object.serialize(), test_object.serialize())
 
-
-
-
+        cloned_object.test = 1
+        cloned_object.dict.test = 2
+        self.assertEqual(test_object.test, 123)
+        self.assertEqual(test_object.dict.test, 321)
+        self.assertIsNot(cloned_object['dict'], test_object['dict'])
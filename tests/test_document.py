@@ -1,6 +1,7 @@
-from unittest import TestCase
+from io import StringIO
+from unittest import TestCase, mock
 
-from elasticsearch_dsl import Integer as DslInteger
+from elasticsearch_dsl import Integer as DslInteger, Document as DslDocument
 
 from src.es_orm import Document, fields
 
@@ -40,6 +41,10 @@ class DocumentTest(TestCase):
         self.assertEqual(test_object._fields_dict.serialize(),
                          {'test_int': {'value': 123}})
 
+        test_object = TestDocument(json_data=StringIO('{"test_int": 123}'))
+        self.assertEqual(test_object._fields_dict.serialize(),
+                         {'test_int': {'value': 123}})
+
     def test_setting_attributes(self):
         class TestAttrsDocument(Document):
             test_int = fields.Integer()
@@ -66,4 +71,160 @@ class DocumentTest(TestCase):
                 attrs_enabled = False
 
         self.assertEqual(TestClass()['test_field']._attrs_enabled, False)
-        self.assertEqual(TestClass()['test_field2']._attrs_enabled, False)
\ No newline at end of file
+        self.assertEqual(TestClass()['test_field2']._attrs_enabled, False)
+
+    def test_fields_dict_copied_on_write(self):
+        class TestCopyOnWrite(Document):
+            test_int = fields.Integer()
+            test_dict = fields.Dict(properties={'inner': fields.Text()})
+
+        test_object = TestCopyOnWrite()
+        self.assertIs(test_object._fields_dict,
+                      TestCopyOnWrite._fields_dict)
+        self.assertEqual(test_object.serialize(), None)
+
+        test_object.test_int = 1
+        test_object.test_dict.inner = "test"
+        self.assertIsNot(test_object._fields_dict,
+                         TestCopyOnWrite._fields_dict)
+        self.assertEqual(TestCopyOnWrite().serialize(), None)
+        self.assertEqual(test_object.serialize(),
+                         {'test_int': {'value': 1},
+                          'test_dict': {'value': {'inner': 'test'}}})
+
+    def test_nested_field_copied_on_read(self):
+        class TestCopyOnRead(Document):
+            test_int = fields.Integer()
+            test_dict = fields.Dict(properties={'inner': fields.Text()})
+
+        test_object = TestCopyOnRead()
+        test_object.test_dict.inner = "test"
+        self.assertIs(test_object._fields_dict['test_int'],
+                      TestCopyOnRead._fields_dict['test_int'])
+        self.assertEqual(TestCopyOnRead().serialize(), None)
+
+        test_object.test_int = 1
+        self.assertIsNot(test_object._fields_dict['test_int'],
+                         TestCopyOnRead._fields_dict['test_int'])
+        self.assertEqual(TestCopyOnRead._fields_dict['test_int'].value, None)
+        self.assertEqual(test_object.serialize(),
+                         {'test_int': {'value': 1},
+                          'test_dict': {'value': {'inner': 'test'}}})
+
+    def test_compiled_serializers(self):
+        class TestCompiled(Document):
+            test_int = fields.Integer()
+            test_text = fields.Text(attrs_enabled=False)
+            test_dict = fields.Dict(properties={'inner': fields.Text()})
+
+        data = {'test_int': {'value': 1, 'pretty_name': 'Test'},
+                'test_dict': {'value': {'inner': 'test'}},
+                'undefined': 'test'}
+        test_object = TestCompiled()
+        test_object._from_dict(data)
+        self.assertEqual(test_object.serialize(),
+                         test_object._fields_dict.serialize())
+        self.assertEqual(test_object.serialize(),
+                         {'test_int': {'value': 1},
+                          'test_dict': {'value': {'inner': 'test'}}})
+        self.assertIn('undefined', data)
+
+        test_object.test_undefined = 'test'
+        self.assertEqual(test_object.serialize()['test_undefined'],
+                         {'value': 'test'})
+
+        test_object._from_dict({})
+        self.assertEqual(test_object.serialize(), None)
+
+    def test_to_field(self):
+        class TestToField(Document):
+            test_int = fields.Integer()
+
+        test_object = TestToField.to_field()
+        test_object.set({'test_int': 1})
+        self.assertIsNot(test_object['test_int'],
+                         TestToField._fields_dict['test_int'])
+        self.assertEqual(test_object.value, {'test_int': 1})
+        self.assertEqual(TestToField._fields_dict['test_int'].value, None)
+        self.assertEqual(
+            TestToField._fields_dict['test_int']._attrs_enabled, True)
+
+    def test_from_hits(self):
+        class TestFromHits(Document):
+            test_int = fields.Integer()
+
+        hits = [{'_index': 'test', '_id': str(i),
+                 '_source': {'test_int': {'value': i}}} for i in range(2)]
+        for test_hits in (hits, {'hits': {'hits': hits}}):
+            test_objects = TestFromHits.from_hits(test_hits)
+            self.assertEqual([test_object.meta.id
+                              for test_object in test_objects], ['0', '1'])
+            self.assertEqual([test_object.test_int
+                              for test_object in test_objects], [0, 1])
+        self.assertIn('_source', hits[0])
+
+    def test_bulk_save_initializes_index_once(self):
+        class TestBulkSave(Document):
+            test_dict = fields.ConvertedDict()
+
+            class Index:
+                name = 'test_bulk_save'
+
+        def parallel_bulk(client, actions, **kwargs):
+            for i, action in enumerate(actions):
+                yield True, {'index': {'_id': str(i),
+                                       '_index': action['_index']}}
+
+        test_objects = [TestBulkSave(test_dict={'inner_dict': {'int': i}})
+                        for i in range(3)]
+        with mock.patch.object(TestBulkSave, 'init') as init, \
+                mock.patch('src.es_orm.helpers.parallel_bulk', parallel_bulk):
+            result = TestBulkSave.bulk_save(test_objects, using=mock.Mock())
+        init.assert_called_once()
+        self.assertEqual(result, (3, []))
+        self.assertEqual([test_object.meta.id
+                          for test_object in test_objects], ['0', '1', '2'])
+
+    def test_mapping_cache_cleared_on_init(self):
+        class TestMappingCache(Document):
+            test_dict = fields.ConvertedDict()
+
+            class Index:
+                name = 'test_mapping_cache'
+
+        TestMappingCache._cached_mappings[(None, None)] = {}
+        TestMappingCache(test_dict={'int': 1}).clean()
+        self.assertIn((None, None), TestMappingCache._cached_mappings)
+
+        with mock.patch.object(DslDocument, 'init') as init:
+            TestMappingCache(test_dict={'inner_dict': {'int': 1}}).clean()
+        init.assert_called_once()
+        self.assertEqual(TestMappingCache._cached_mappings, {})
+
+    def test_attributes_added_to_class(self):
+        class TestAddedAttrs(Document):
+            test_int = fields.Integer()
+
+        TestAddedAttrs._added_attr = 'class'
+        test_object = TestAddedAttrs()
+        self.assertEqual(test_object._added_attr, 'class')
+        test_object._added_attr = 'instance'
+        self.assertEqual(test_object._added_attr, 'instance')
+        self.assertNotIn('_added_attr', test_object._fields_dict)
+
+    def test_set_index_settings(self):
+        class TestIndexSettings(Document):
+            class Index:
+                name = 'test_index_settings'
+
+        settings = {'refresh_interval': '30s'}
+        es_client = mock.Mock()
+        TestIndexSettings.set_index_settings(settings, using=es_client)
+        es_client.indices.put_settings.assert_called_once_with(
+            index='test_index_settings', body=settings)
+
+        es_client.reset_mock()
+        TestIndexSettings.set_index_settings(settings, index='test_other',
+                                             using=es_client)
+        es_client.indices.put_settings.assert_called_once_with(
+            index='test_other', body=settings)
\ No newline at end of file
@@ -1,8 +1,8 @@
 import os
 import unittest
 import json
+from copy import deepcopy
 from datetime import datetime
-from time import sleep
 
 import elasticsearch_dsl
 
@@ -12,6 +12,47 @@ from src.es_orm.fields import (Integer, Text, Date, Choices, Field, Dict, List,
 from src.es_orm.exceptions import (ValidationException, InitializationRequired)
 
 
+# Cleaning changes nested values in place, so tests use deep copies of it.
+VALID_DATA = {
+    "array": [1, 2, "3"],
+    "int_array": [1, 2, 3],
+    "integer": 512,
+    "text": "Text message",
+    "date": "00:00:00 02.02.02",
+    "choices": "2 option",
+    "dict": {'first': 'value 1', 'second': 'value 2'},
+    "converted_dict": {'first': 'value 1', 'second': 'value 2'},
+    "undefined_field": 123.512,
+    "undefined_field_with_value": {
+        "value": 123.11
+    }
+}
+VALID_JSON = json.dumps(VALID_DATA)
+
+
+def _clean(*docs):
+    """
+    Validates the documents. If the mapping of some field has grown, the
+    index of the document is initialized and it's validated once again.
+    """
+    for doc in docs:
+        try:
+            doc.clean()
+        except InitializationRequired:
+            doc.init()
+            doc.clean()
+
+
+def _get_source(doc):
+    """
+    Returns the source of the saved document stored in the DB. The
+    document is got by its id, which doesn't need the index to be
+    refreshed, unlike searching it.
+    """
+    return elasticsearch_dsl.connections.get_connection().get(
+        index=doc.Index.name, id=doc.meta['id'])['_source']
+
+
 class DocumentTests(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -19,7 +60,12 @@ class DocumentTests(unittest.TestCase):
         if not es_host:
             raise EnvironmentError('Please provide ES_HOST environment '
                                    'variable to start unittesting.')
-        connect(es_host)
+        # The connection created by the tests package is shared by the whole
+        # session, so its pool of keep-alive connections isn't recreated.
+        try:
+            elasticsearch_dsl.connections.get_connection()
+        except KeyError:
+            connect(es_host)
 
         class TestStrictClass(Document):
             array = List()
@@ -116,35 +162,21 @@ class DocumentTests(unittest.TestCase):
             class Index:
                 name = "test_lists_index"
 
-        if elasticsearch_dsl.Index('test_strict_index').exists():
-            elasticsearch_dsl.Index('test_strict_index').delete()
-        TestStrictClass.init()
-
-        if elasticsearch_dsl.Index('test_warning_index').exists():
-            elasticsearch_dsl.Index('test_warning_index').delete()
-        TestWarningClass.init()
-
-        if elasticsearch_dsl.Index('test_disabled_index').exists():
-            elasticsearch_dsl.Index('test_disabled_index').delete()
-        TestDisabledClass.init()
-
-        if elasticsearch_dsl.Index('test_dict_in_dict_without_conversion').\
-                exists():
-            elasticsearch_dsl.Index('test_dict_in_dict_without_conversion').\
-                delete()
-        WithoutConversion.init()
-        
-        if elasticsearch_dsl.Index('test_timestamp_index').exists():
-            elasticsearch_dsl.Index('test_timestamp_index').delete()
-        TimestampTest.init()
+        class InheritedWithoutConversion(WithoutConversion):
+            pass
 
-        if elasticsearch_dsl.Index('test_value_disabled_index').exists():
-            elasticsearch_dsl.Index('test_value_disabled_index').delete()
-        TestValueDisabled.init()
+        class TestExport(Document):
+            dict = Dict(properties={
+                "date": Date(),
+                "dict": Dict()
+            })
 
-        if elasticsearch_dsl.Index('test_lists_index').exists():
-            elasticsearch_dsl.Index('test_lists_index').delete()
-        TestLists.init()
+        class TestDocToField(Document):
+            integer = Integer()
+            text = Text()
+            dict = ConvertedDict()
+            usual_dict = Dict(properties={'test': Integer()})
+            doc_field = TimestampTest.to_field()
 
         cls.test_strict_class = TestStrictClass
         cls.test_warning_class = TestWarningClass
@@ -153,6 +185,16 @@ class DocumentTests(unittest.TestCase):
         cls.test_timestamp_class = TimestampTest
         cls.test_value_disabled_class = TestValueDisabled
         cls.test_lists_class = TestLists
+        cls.test_inherited_without_conversion_class = \
+            InheritedWithoutConversion
+        cls.test_export_class = TestExport
+        cls.test_doc_to_field_class = TestDocToField
+
+        for document_class in (TestStrictClass, TestWarningClass,
+                               TestDisabledClass, WithoutConversion,
+                               TimestampTest, TestValueDisabled, TestLists):
+            document_class._index.delete(ignore=[400, 404])
+            document_class.init()
 
     @classmethod
     def tearDownClass(cls) -> None:
@@ -164,23 +206,36 @@ class DocumentTests(unittest.TestCase):
         elasticsearch_dsl.Index(cls.test_timestamp_class.Index.name).delete()
         elasticsearch_dsl.Index(cls.test_lists_class.Index.name).delete()
 
+    def validation_classes(self):
+        """
+        Returns the test Documents with the strict, warning and disabled
+        validation levels, which declare the same fields.
+        """
+        return (self.test_strict_class, self.test_warning_class,
+                self.test_disabled_class)
+
+    def assert_valid_instance(self, instance, expected_data):
+        for field, value_to_check in expected_data.items():
+            self.assertEqual(instance[field].value, value_to_check)
+        self.assertTrue('undefined_field' not in instance)
+
     def test_init(self):
-        try:
-            test_data = {
-                "array": [1, 2, '3'],
-                "int_array": [1, 2, 3],
-                "integer": 512,
-                "text": "Text message",
-                "date": "00:00:00 02.02.02",
-                "choices": "2 option",
-                "dict": {'first': 'value 1', 'second': 'value 2'},
-                "converted_dict": {'first': 'value 1', 'second': 'value 2'}
-            }
-            self.test_strict_class(**test_data)
-            self.test_warning_class(**test_data)
-            self.test_disabled_class(**test_data)
-        except Exception as error:
-            self.fail(error)
+        test_data = {
+            "array": [1, 2, '3'],
+            "int_array": [1, 2, 3],
+            "integer": 512,
+            "text": "Text message",
+            "date": "00:00:00 02.02.02",
+            "choices": "2 option",
+            "dict": {'first': 'value 1', 'second': 'value 2'},
+            "converted_dict": {'first': 'value 1', 'second': 'value 2'}
+        }
+        for document_class in self.validation_classes():
+            with self.subTest(document_class=document_class.__name__):
+                try:
+                    document_class(**test_data)
+                except Exception as error:
+                    self.fail(error)
 
     def test_set(self):
         test_object = self.test_strict_class()
@@ -197,7 +252,7 @@ class DocumentTests(unittest.TestCase):
         self.assertEqual(test_object.array, [1, 2, 3])
 
     def test_valid_data_assertion(self):
-        valid_data = {
+        empty_data = {
             "array": None,
             "int_array": None,
             "integer": None,
@@ -210,47 +265,6 @@ class DocumentTests(unittest.TestCase):
             "undefined_field_with_value": None
         }
 
-        try:
-            strict_instance = self.test_strict_class(**valid_data)
-            warning_instance = self.test_warning_class(**valid_data)
-            disabled_instance = self.test_disabled_class(**valid_data)
-            strict_instance.clean()
-            warning_instance.clean()
-            disabled_instance.clean()
-        except ValidationException as error:
-            self.fail(error)
-        except Exception as error:
-            self.fail(f"There was an error validation "
-                      f"empty valid object: {error}")
-
-        valid_data = {
-            "array": [1, 2, "3"],
-            "int_array": [1, 2, 3],
-            "integer": 512,
-            "text": "Text message",
-            "date": "00:00:00 02.02.02",
-            "choices": "2 option",
-            "dict": {'first': 'value 1', 'second': 'value 2'},
-            "converted_dict": {'first': 'value 1', 'second': 'value 2'},
-            "undefined_field": 123.512,
-            "undefined_field_with_value": {
-                "value": 123.11
-            }
-        }
-
-        json_data = json.dumps(valid_data)
-        # Initialize using json
-
-        try:
-            strict_instance = self.test_strict_class(json_data=json_data)
-            warning_instance = self.test_warning_class(json_data=json_data)
-            disabled_instance = self.test_disabled_class(json_data=json_data)
-            strict_instance.clean()
-            warning_instance.clean()
-            disabled_instance.clean()
-        except ValidationException as error:
-            self.fail(error)
-
         expected_data = {
             "array": ['1', '2', '3'],
             "int_array": [1, 2, 3],
@@ -262,82 +276,59 @@ class DocumentTests(unittest.TestCase):
             "converted_dict": {'first': 'value 1', 'second': 'value 2'}
         }
 
-        for field in expected_data.keys():
-            value_to_check = expected_data[field]
-            self.assertEqual(strict_instance[field].value, value_to_check)
-            self.assertEqual(warning_instance[field].value, value_to_check)
-            self.assertEqual(disabled_instance[field].value, value_to_check)
-
-        self.assertTrue('undefined_field' not in strict_instance)
-        self.assertTrue('undefined_field' not in warning_instance)
-        self.assertTrue('undefined_field' not in disabled_instance)
-
-        # Assertion via initialisator
-        while True:
-            try:
-                strict_instance = self.test_strict_class(**valid_data)
-                warning_instance = self.test_warning_class(**valid_data)
-                disabled_instance = self.test_disabled_class(**valid_data)
-                strict_instance.clean()
-                warning_instance.clean()
-                disabled_instance.clean()
-            except ValidationException as error:
-                self.fail(error)
-            except InitializationRequired:
-                continue
-            break
-
-        for field in expected_data.keys():
-            value_to_check = expected_data[field]
-            self.assertEqual(strict_instance[field].value, value_to_check)
-            self.assertEqual(warning_instance[field].value, value_to_check)
-            self.assertEqual(disabled_instance[field].value, value_to_check)
-
-        self.assertTrue('undefined_field' not in strict_instance)
-        self.assertTrue('undefined_field' not in warning_instance)
-        self.assertTrue('undefined_field' not in disabled_instance)
-
-        # Direct assertion
-        try:
-            strict_instance = self.test_strict_class()
-            warning_instance = self.test_warning_class()
-            disabled_instance = self.test_disabled_class()
-
-            for field in valid_data.keys():
-                value_to_set = valid_data[field]
-                setattr(strict_instance, field, value_to_set)
-                setattr(warning_instance, field, value_to_set)
-                setattr(disabled_instance, field, value_to_set)
-
-            strict_instance.clean()
-            warning_instance.clean()
-            disabled_instance.clean()
-        except ValidationException as error:
-            self.fail(error)
-
-        for field in expected_data.keys():
-            value_to_check = expected_data[field]
-            self.assertEqual(strict_instance[field].value, value_to_check)
-            self.assertEqual(warning_instance[field].value, value_to_check)
-            self.assertEqual(disabled_instance[field].value, value_to_check)
-
-        self.assertTrue('undefined_field' not in strict_instance)
-        self.assertTrue('undefined_field' not in warning_instance)
-        self.assertTrue('undefined_field' not in disabled_instance)
-
+        for document_class in self.validation_classes():
+            with self.subTest(document_class=document_class.__name__):
+                try:
+                    document_class(**empty_data).clean()
+                except ValidationException as error:
+                    self.fail(error)
+                except Exception as error:
+                    self.fail(f"There was an error validation "
+                              f"empty valid object: {error}")
+
+                # Initialize using json
+                instance = document_class(json_data=VALID_JSON)
+                try:
+                    instance.clean()
+                except ValidationException as error:
+                    self.fail(error)
+                self.assert_valid_instance(instance, expected_data)
+
+                # Assertion via initialisator
+                instance = document_class(**deepcopy(VALID_DATA))
+                try:
+                    _clean(instance)
+                except ValidationException as error:
+                    self.fail(error)
+                self.assert_valid_instance(instance, expected_data)
+
+                # Direct assertion
+                instance = document_class()
+                try:
+                    for field, value_to_set in deepcopy(VALID_DATA).items():
+                        setattr(instance, field, value_to_set)
+                    instance.clean()
+                except ValidationException as error:
+                    self.fail(error)
+                self.assert_valid_instance(instance, expected_data)
+
+                try:
+                    instance.to_dict()
+                except Exception as error:
+                    self.fail('Не удалось перевести валидные данные в '
+                              'словарь: '+str(error.args))
+
+        # Documents of all the validation levels are saved in one bulk
+        # request, which returns when they become visible to search.
+        instances = [document_class(**deepcopy(VALID_DATA))
+                     for document_class in self.validation_classes()]
         try:
-            strict_instance.save()
-            warning_instance.save()
-            disabled_instance.save()
+            result = self.test_strict_class.bulk_save(
+                instances, forced=True, refresh='wait_for')
         except Exception as error:
             self.fail('Не удалось сохранить данные в БД: '+str(error.args))
-
-        try:
-            strict_instance.to_dict()
-            warning_instance.to_dict()
-            disabled_instance.to_dict()
-        except Exception as error:
-            self.fail('Не удалось перевести валидные данные в словарь: '+str(error.args))
+        self.assertEqual(result, (len(instances), []))
+        strict_instance = instances[0]
 
         expected_document = {
             "array": {
@@ -377,11 +368,7 @@ class DocumentTests(unittest.TestCase):
                 "value": '123.11'
             }
         }
-        sleep(1)
-        db_document = elasticsearch_dsl.Search().\
-            index(strict_instance.Index.name).\
-            query("match", _id=strict_instance.meta['id']).\
-            execute()[0].to_dict()
+        db_document = _get_source(strict_instance)
         self.assertEqual(expected_document, db_document)
 
     def test_invalid_data_assertion(self):
@@ -447,14 +434,11 @@ class DocumentTests(unittest.TestCase):
         }
         try:
             test_object = self.test_strict_class(**data)
-            test_object.save()
+            test_object.save(refresh='wait_for')
         except Exception as error:
             self.fail('Не удалось сохранить словарь в словаре: '
                       ''+str(error.args))
-        sleep(1.5)
-        db_document = elasticsearch_dsl.Search().\
-            index(test_object.Index.name).\
-            query("match", _id=test_object.meta['id']).execute()[0].to_dict()
+        db_document = _get_source(test_object)
         expected_value = {
             "dict": {
                 "value": {
@@ -504,13 +488,13 @@ class DocumentTests(unittest.TestCase):
             }
         }
 
-        class WithoutConversion(self.test_without_conversion_class):
-            pass
+        without_conversion_class = \
+            self.test_inherited_without_conversion_class
 
         self.assertEqual(expected_mapping,
-                         WithoutConversion._index.get_mapping())
+                         without_conversion_class.get_mapping())
 
-        test = WithoutConversion(dict={'text': 5211, 'int': 2512})
+        test = without_conversion_class(dict={'text': 5211, 'int': 2512})
         test.save()
 
         expected_value = {'dict': {'value': {'text': '5211', 'int': 2512}}}
@@ -609,9 +593,7 @@ class DocumentTests(unittest.TestCase):
         self.assertEqual(dict_defaults, expected_defaults)
         
     def test_timestamp(self):
-        self.test_timestamp_class._index.delete()
-        self.test_timestamp_class.init()
-        mapping = self.test_timestamp_class._index.get_mapping()
+        mapping = self.test_timestamp_class.get_mapping()
         expected_mapping = {
             'test_timestamp_index': {
                 'mappings': {
@@ -690,13 +672,7 @@ class DocumentTests(unittest.TestCase):
         exported_data = test_data.serialize(True)
         self.assertEqual(exported_data['_source']['dict']['value'], test_json)
 
-        class TestExport(Document):
-            dict = Dict(properties={
-                "date": Date(),
-                "dict": Dict()
-            })
-
-        test_object = TestExport(
+        test_object = self.test_export_class(
             dict={'date': "2020-01-02", 'dict':
                 {'field1': 'value1', 'field2': {'field3': 'value3'}}})
 
@@ -715,14 +691,8 @@ class DocumentTests(unittest.TestCase):
         self.assertEqual(expected_value, test_object.serialize())
 
     def test_doc_to_field(self):
-        class TestDocToField(Document):
-            integer = Integer()
-            text = Text()
-            dict = ConvertedDict()
-            usual_dict = Dict(properties={'test': Integer()})
-            doc_field = self.test_timestamp_class.to_field()
         self.maxDiff = None
-        doc_field_mapping = TestDocToField._doc_type.\
+        doc_field_mapping = self.test_doc_to_field_class._doc_type.\
             mapping.to_dict()['properties']['doc_field']['properties']['value']
         doc_field_mapping.pop('type')
         expected_mapping = {
@@ -742,8 +712,8 @@ class DocumentTests(unittest.TestCase):
         self.assertEqual(doc_field_mapping, expected_mapping)
 
     def test_value_disabled(self):
-        mapping = self.test_value_disabled_class._index.\
-            get_mapping()[self.test_value_disabled_class.Index.name]\
+        mapping = self.test_value_disabled_class.get_mapping()\
+            [self.test_value_disabled_class.Index.name]\
             ['mappings']['properties']
         expected_mapping = {
             "text": {
@@ -846,10 +816,10 @@ class DocumentTests(unittest.TestCase):
 
     def test_lists(self):
         # Test whether we can store dicts in lists
-        mapping = self.test_lists_class._index.get_mapping()\
+        mapping = self.test_lists_class.get_mapping()\
             [self.test_lists_class.Index.name]['mappings']['properties']
         list_of_documents_mapping = self.test_value_disabled_class.\
-            _index.get_mapping()[self.test_value_disabled_class.Index.name]\
+            get_mapping()[self.test_value_disabled_class.Index.name]\
             ['mappings']
 
         expected_mapping = {
@@ -1,6 +1,8 @@
 from unittest import TestCase
 from datetime import datetime
 
+from dateutil import parser
+
 from src.es_orm.fields import (Date, Choices, List, Integer, Dict,
                                ConvertedDict, Text, InnerDocument,
                                Float, Bytes)
@@ -19,6 +21,19 @@ class DateFieldTest(TestCase):
         test_object.clean()
         self.assertEqual(datetime.fromtimestamp(0), test_object.value)
 
+    def test_deserialize_iso_formats(self):
+        test_object = Date()
+        for value in (datetime(2022, 1, 10),
+                      datetime(2022, 1, 10, 1, 2, 3, 4)):
+            self.assertEqual(test_object.deserialize(value.isoformat()),
+                             value)
+        for value in ('2022-01-10T00:00:00Z', '2022-01-10T00:00:00+00:00',
+                      '2022-01-10T00:00:00+03:00', '20220110T000000'):
+            expected = parser.parse(value)
+            result = test_object.deserialize(value)
+            self.assertEqual(result, expected)
+            self.assertIs(type(result.tzinfo), type(expected.tzinfo))
+
     def test_clean_set_custom_format(self):
         test_object = Date('%d.%m.%Y')
         test_object.set('10.01.2022')
@@ -38,6 +53,15 @@ class DateFieldTest(TestCase):
         test_object.clean()
         self.assertEqual(datetime.fromtimestamp(1000), test_object.value)
 
+    def test_serialize_batch(self):
+        dates = [datetime(2022, 1, 10), datetime(2022, 1, 10, 1, 2, 3, 4)]
+        test_object = Date()
+        self.assertEqual(test_object.serialize_batch(dates),
+                         [date.isoformat() for date in dates])
+        self.assertEqual(test_object.serialize_batch([*dates, "2022"]),
+                         [date.isoformat() for date in dates] + ["2022"])
+        self.assertEqual(test_object.value, None)
+
 
 class ChoicesFieldTest(TestCase):
     def test_init(self):
@@ -64,6 +88,14 @@ class ChoicesFieldTest(TestCase):
         test_object.set(None)
         test_object.clean()
 
+    def test_choices_not_changed(self):
+        choices = [1, 2, 3]
+        test_object = Choices(choices)
+        choices.append(4)
+        test_object.set(4)
+        self.assertRaises(ValidationException, test_object.clean)
+        self.assertIs(test_object.clone()._choices, test_object._choices)
+
 
 class ListFieldTest(TestCase):
     def test_init(self):
@@ -100,6 +132,16 @@ class ListFieldTest(TestCase):
         test_object.set(None)
         test_object.clean()
 
+    def test_clean_elements_of_exact_type(self):
+        test_object = List(Text())
+        test_object.set(["test", "test2"])
+        test_object.clean()
+        self.assertEqual(test_object.value, ["test", "test2"])
+
+        test_object.set(["test", ""])
+        test_object.clean()
+        self.assertEqual(test_object.value, ["test", None])
+
     def test_clean_complex_object(self):
         test_object = List(Dict(properties={
             "inner_dict": Dict(properties={
@@ -155,6 +197,42 @@ class ListFieldTest(TestCase):
         self.assertTrue('warning' in test_object._attrs)
         self.assertTrue('int' in test_object._attrs['warning'])
 
+    def test_serialize(self):
+        test_object = List(Integer())
+        test_object.set([1, 2, 3])
+        self.assertEqual(test_object.serialize(), {'value': [1, 2, 3]})
+
+        test_object = List(Date(), attrs_enabled=False)
+        test_object.set([datetime(2022, 1, 10)])
+        self.assertEqual(test_object.serialize(), ['2022-01-10T00:00:00'])
+
+    def test_element_copy_not_kept(self):
+        test_object = List(Integer())
+        test_object.set([1, 2, 3])
+        test_object.clean()
+        self.assertIsNone(test_object._element_object.value)
+
+        test_object = List(Dict(properties={'int': Integer()}))
+        test_object.set([{'int': 1}, {'int': 2}])
+        test_object.clean()
+        self.assertEqual(test_object.serialize(),
+                         {'value': [{'int': 1}, {'int': 2}]})
+        self.assertIsNone(test_object._element_object['int'].value)
+
+        test_object = List(Dict(), attrs_enabled=False)
+        for key in ('k0', 'k1', 'k2'):
+            test_object.set([{key: 'value'}])
+            test_object.clean()
+            self.assertEqual(test_object.serialize(), [{key: 'value'}])
+        self.assertEqual(list(test_object._element_object.keys()), [])
+
+    def test_converted_dict_mapping_grows(self):
+        test_object = List(ConvertedDict(), attrs_enabled=False)
+        test_object.set([{'int': 1}, {'inner_dict': {'inner_int': 42}}])
+        self.assertRaises(InitializationRequired, test_object.clean)
+        self.assertIn('inner_dict', test_object.mapping()['properties'])
+        test_object.clean()
+
 
 class ConvertedDictTest(TestCase):
     def test_init(self):
@@ -171,6 +249,29 @@ class ConvertedDictTest(TestCase):
         self.assertEqual(list(test_object._properties['inner_dict'].keys()),
                          ['key', 'value'])
 
+    def test_shared_mapping(self):
+        test_object = ConvertedDict()
+        test_object.set({'inner_dict': {'inner_int': 42}})
+        self.assertRaises(InitializationRequired, test_object.clean)
+
+        other_object = ConvertedDict()
+        other_object.set({'int': 123})
+        self.assertIs(other_object._properties,
+                      test_object._properties['inner_dict'])
+        self.assertIs(test_object.clone()._properties,
+                      test_object._properties)
+        self.assertEqual(test_object.clone().mapping(),
+                         test_object.mapping())
+
+    def test_clean_with_uneven_depth(self):
+        test_object = ConvertedDict()
+        test_object.set({'int': 123, 'empty': {},
+                         'inner_dict': {'a': {'b': {'c': 1}}, 'd': 2}})
+
+        self.assertRaises(InitializationRequired, test_object.clean)
+        self.assertEqual(test_object._ConvertedDict__depth, 4)
+        test_object.clean()
+
     def test_serialize(self):
         test_object = ConvertedDict()
         test_object.set({'int': 123, 'inner_dict': {'inner_int': 42}})
@@ -239,6 +340,13 @@ class ConvertedDictTest(TestCase):
         test_object.deserialize({"value": "some_test_data"})
         self.assertEqual(test_object.value, "some_test_data")
 
+    def test_deserialize_invalid_structure(self):
+        test_object = ConvertedDict()
+        for data in ([{"key": "int"}],
+                     [{"value": 123}],
+                     [{"key": "int", "value": 123, "inner_dict": []}]):
+            self.assertRaises(ValueError, test_object.deserialize, data)
+
 
 class InnerDocumentTest(TestCase):
     def test_inner_document(self):
@@ -255,6 +363,18 @@ class InnerDocumentTest(TestCase):
             if field_object._attrs_enabled:
                 self.fail(f'There is attrs enabled to the field {field_name}')
 
+    def test_inherited_fields(self):
+        class ParentInnerDocument(InnerDocument):
+            int = Integer()
+
+        class ChildInnerDocument(ParentInnerDocument):
+            text = Text()
+
+        self.assertEqual(ParentInnerDocument._field_names, ('int',))
+        self.assertEqual(ChildInnerDocument._field_names, ('int', 'text'))
+        self.assertEqual(list(ChildInnerDocument()._properties.keys()),
+                         ['int', 'text'])
+
 
 class BytesTest(TestCase):
     def test_bytes(self):
@@ -264,4 +384,12 @@ class BytesTest(TestCase):
         test_object.set(test_bytes)
         self.assertEqual(test_object._serialize(), test_bytes_str)
         self.assertEqual(test_object._deserialize(test_bytes_str),
-                         test_bytes)
\ No newline at end of file
+                         test_bytes)
+
+    def test_ascii_bytes(self):
+        test_object = Bytes()
+        test_object.set(b'1234\n')
+        self.assertEqual(test_object._serialize(), '1234\n')
+        test_object.set('тест')
+        self.assertEqual(test_object._serialize(),
+                         'тест'.encode('ascii', 'backslashreplace').decode())
\ No newline at end of file